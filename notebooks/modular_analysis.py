@@ -1,64 +1,124 @@
 import os
 import re
+import json
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.ticker import EngFormatter, MaxNLocator
 
+# pandas' multithreaded pyarrow CSV engine when available, else the default C parser
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
 SNIPER_RESULTS_DIR = "/home/skataoka26/COSC_498/miniMXE/results/sniper_llc_32mb_16w_20251002T020050Z"
 DYNAMORIO_LOGS_DIR = "/home/skataoka26/COSC_498/miniMXE/results_trace/logs"
 TIMESTAMP_PREFIX = "20250929T203551Z"
 
 # Global cache for parsed data
 _cache = {}
+# get_processed results per runid; cleared whenever load_data re-parses
+_processed_cache = {}
 
 def safe_div(numer, denom):
-    numer = np.array(numer, dtype=float)
-    denom = np.array(denom, dtype=float)
-    with np.errstate(divide='ignore', invalid='ignore'):
-        out = np.where((denom > 0) & np.isfinite(denom), numer / denom, np.nan)
+    numer = np.asarray(numer, dtype=float)
+    denom = np.asarray(denom, dtype=float)
+    out = np.full(np.broadcast_shapes(numer.shape, denom.shape), np.nan)
+    # only lanes with a positive finite denominator are divided; the rest stay NaN
+    np.divide(numer, denom, out=out, where=(denom > 0) & np.isfinite(denom))
     return out
 
 def geomean(values):
-    vals = np.array([v for v in np.ravel(values) if v > 0 and np.isfinite(v)], dtype=float)
-    return float(np.exp(np.mean(np.log(vals)))) if len(vals) else np.nan
+    vals = np.asarray(values, dtype=float).ravel()
+    vals = vals[np.isfinite(vals) & (vals > 0)]
+    return float(np.exp(np.log(vals).mean())) if vals.size else np.nan
+
+SNIPER_ENERGY_COLS = ["benchmark", "config", "time_s", "energy_exact_J", "leak_J", "dyn_exact_nJ"]
+SNIPER_SUMMARY_BASE = ["benchmark", "config", "ipc", "time_ns", "l3_miss_rate_pct"]
+
+def _summary_col_wanted(col):
+    if col in SNIPER_SUMMARY_BASE:
+        return True
+    cl = col.lower()
+    return ("l3" in cl or "llc" in cl) and (
+        "access" in cl or "read" in cl or "write" in cl or "hit" in cl or "miss" in cl or "evict" in cl or "wb" in cl
+    )
+
+SNIPER_CACHE_FILE = "_cache_sniper.parquet"
+SNIPER_CACHE_META = "_cache_meta.json"
+
+def _sniper_output_dirs(base_dir):
+    dirs = []
+    for root, _, files in os.walk(base_dir):
+        if os.path.basename(root).startswith("output_") and "summary.csv" in files and "energy_bounds.csv" in files:
+            dirs.append(root)
+    return sorted(dirs)
+
+def _cache_key(out_dirs):
+    key = []
+    for root in out_dirs:
+        for name in ("energy_bounds.csv", "summary.csv"):
+            st = os.stat(os.path.join(root, name))
+            key.append([os.path.join(root, name), st.st_mtime_ns, st.st_size])
+    return key
+
+def _load_cache(base_dir, key):
+    try:
+        with open(os.path.join(base_dir, SNIPER_CACHE_META)) as f:
+            if json.load(f) != key:
+                return None
+        return pd.read_parquet(os.path.join(base_dir, SNIPER_CACHE_FILE))
+    except Exception:
+        return None
+
+def _save_cache(df, base_dir, key):
+    try:
+        df.to_parquet(os.path.join(base_dir, SNIPER_CACHE_FILE), engine="pyarrow", compression="zstd")
+        with open(os.path.join(base_dir, SNIPER_CACHE_META), "w") as f:
+            json.dump(key, f)
+    except Exception as e:
+        print(f"[parse_sniper] Could not write cache under {base_dir}: {e}")
 
 def parse_sniper(base_dir):
     energy_rows = []
     summary_rows = []
     print(f"[parse_sniper] Searching under: {base_dir}")
-    for root, _, files in os.walk(base_dir):
-        if os.path.basename(root).startswith("output_") and "summary.csv" in files and "energy_bounds.csv" in files:
-            energy_path = os.path.join(root, "energy_bounds.csv")
-            summary_path = os.path.join(root, "summary.csv")
-            try:
-                e = pd.read_csv(energy_path)
-                s = pd.read_csv(summary_path)
-            except Exception:
-                continue
-            e_keep = ["benchmark", "config", "time_s", "energy_exact_J", "leak_J", "dyn_exact_nJ"]
-            e = e[[c for c in e_keep if c in e.columns]].copy()
-            s_base = ["benchmark", "config", "ipc", "time_ns", "l3_miss_rate_pct"]
-            keep_s = [c for c in s_base if c in s.columns]
-            for col in s.columns:
-                cl = col.lower()
-                if ("l3" in cl or "llc" in cl) and (
-                    "access" in cl or "read" in cl or "write" in cl or "hit" in cl or "miss" in cl or "evict" in cl or "wb" in cl
-                ):
-                    if col not in keep_s:
-                        keep_s.append(col)
-            s = s[keep_s].copy()
-            for col in ["time_s", "energy_exact_J", "leak_J", "dyn_exact_nJ"]:
-                if col in e.columns:
-                    e[col] = pd.to_numeric(e[col], errors="coerce")
-            for col in s.columns:
-                if col not in ("benchmark", "config"):
-                    s[col] = pd.to_numeric(s[col], errors="coerce")
-            if "dyn_exact_nJ" in e.columns:
-                e["dyn_exact_J"] = e["dyn_exact_nJ"] * 1e-9
-            energy_rows.append(e)
-            summary_rows.append(s)
+    out_dirs = _sniper_output_dirs(base_dir)
+    key = _cache_key(out_dirs)
+    if out_dirs:
+        df = _load_cache(base_dir, key)
+        if df is not None:
+            print(f"[parse_sniper] Loaded cached DataFrame shape: {df.shape}")
+            return df
+    for root in out_dirs:
+        energy_path = os.path.join(root, "energy_bounds.csv")
+        summary_path = os.path.join(root, "summary.csv")
+        try:
+            # the pyarrow engine only takes a list for usecols, so resolve it from the header
+            e_cols = [c for c in pd.read_csv(energy_path, nrows=0).columns if c in SNIPER_ENERGY_COLS]
+            s_cols = [c for c in pd.read_csv(summary_path, nrows=0).columns if _summary_col_wanted(c)]
+            e = pd.read_csv(energy_path, engine=CSV_ENGINE, usecols=e_cols)
+            s = pd.read_csv(summary_path, engine=CSV_ENGINE, usecols=s_cols)
+        except Exception:
+            continue
+        e = e[[c for c in SNIPER_ENERGY_COLS if c in e.columns]]
+        s = s[[c for c in SNIPER_SUMMARY_BASE if c in s.columns] +
+              [c for c in s.columns if c not in SNIPER_SUMMARY_BASE]]
+        # typed columns parse as numbers already; only coerce ones that came back as text
+        for col in e.columns.intersection(["time_s", "energy_exact_J", "leak_J", "dyn_exact_nJ"]):
+            if e[col].dtype == object:
+                e[col] = pd.to_numeric(e[col], errors="coerce")
+        for col in s.columns.drop(["benchmark", "config"], errors="ignore"):
+            if s[col].dtype == object:
+                s[col] = pd.to_numeric(s[col], errors="coerce")
+        if "dyn_exact_nJ" in e.columns:
+            e["dyn_exact_J"] = e["dyn_exact_nJ"] * 1e-9
+        energy_rows.append(e)
+        summary_rows.append(s)
     if not energy_rows or not summary_rows:
         raise FileNotFoundError(f"Could not find summary.csv and energy_bounds.csv under: {base_dir}")
     E = pd.concat(energy_rows, ignore_index=True)
@@ -66,139 +126,98 @@ def parse_sniper(base_dir):
     df = pd.merge(E, S, on=["benchmark", "config"], how="inner")
     df = df.dropna(subset=["benchmark", "config", "time_s", "energy_exact_J"])
     print(f"[parse_sniper] Merged DataFrame shape: {df.shape}")
+    _save_cache(df, base_dir, key)
     return df
 
-def _kv_from_line(s):
-    kv = {}
-    m = re.search(r"\bscope=(\w+)", s)
-    if m:
-        kv["scope"] = m.group(1)
-    for k, v in re.findall(r"([A-Za-z0-9_]+)=([+\-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+\-]?\d+)?|nan)", s):
-        try:
-            kv[k] = float("nan") if v.lower() == "nan" else float(v)
-        except Exception:
-            pass
-    return kv
+_SCOPE_RE = re.compile(r"\bscope=(\w+)")
+_KV_RE = re.compile(r"([A-Za-z0-9_]+)=([+\-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+\-]?\d+)?|nan)")
 
-def parse_dynamorio(logs_dir, ts_prefix):
-    rows = []
+def _read_intervals(fpath):
+    """One row per scope=interval/final line, one float column per key (NaN where absent)."""
+    with open(fpath, "r", errors="ignore") as f:
+        lines = [ln.strip() for ln in f.read().split("\n") if "scope=" in ln]
+    if not lines:
+        return None
+    lines = pd.Series(lines, dtype=object)
+    scope = lines.str.extract(_SCOPE_RE, expand=False).str.lower()
+    lines = lines[scope.isin(["interval", "final"])].reset_index(drop=True)
+    if lines.empty:
+        return None
+    kv = lines.str.extractall(_KV_RE).droplevel("match").rename_axis("line").reset_index()
+    kv = kv.drop_duplicates(["line", 0], keep="last")   # a repeated key keeps its last value
+    wide = kv.assign(val=kv[1].astype(float)).pivot(index="line", columns=0, values="val")
+    wide = wide.reindex(range(len(lines))).rename_axis(columns=None)
+    # non-finite values count as missing everywhere below
+    return wide.replace([np.inf, -np.inf], np.nan)
+
+def _wavg(ivals, keys, weights):
+    """Weighted mean of each key over intervals; the denominator is all finite weights."""
+    w = weights.to_numpy(dtype=float)
+    den = np.nansum(w)
+    if not den > 0:
+        return dict.fromkeys(keys, np.nan)
+    V = ivals.reindex(columns=keys).to_numpy(dtype=float)
+    num = np.nansum(V * np.where(w > 0, w, 0.0)[:, None], axis=0)
+    return dict(zip(keys, num / den))
+
+R_WEIGHT_KEYS = ["read_entropy", "read_local_entropy", "read_footprint90L"]
+W_WEIGHT_KEYS = ["write_entropy", "write_local_entropy", "write_footprint90L"]
+CUMULATIVE_LAST_KEYS = [
+    "reads", "writes", "bytes_read", "bytes_written",
+    "global_footprint_bytes", "read_unique_lines", "write_unique_lines",
+]
+MAX_KEYS = ["read_unique", "write_unique", "uniq_lines", "uniq_pages", "footprint_bytes"]
+
+def _parse_one(fpath, benchmark):
+    """Aggregate row for one rwstats log, or None if it is unreadable or has no intervals."""
+    try:
+        ivals = _read_intervals(fpath)
+    except Exception:
+        return None
+    if ivals is None:
+        return None
+    # per-interval deltas of the running counters stand in for missing *_total weights
+    d = ivals.reindex(columns=["reads", "writes"]).to_numpy()
+    d = np.diff(d, axis=0, prepend=np.nan)
+    d[~(d >= 0)] = np.nan
+    wts = ivals.reindex(columns=["read_total", "write_total"]).fillna(
+        pd.DataFrame(d, index=ivals.index, columns=["read_total", "write_total"]))
+    agg = {"benchmark": benchmark, "scope": "aggregate"}
+    agg.update(wts.sum(min_count=1).to_dict())
+    agg.update(_wavg(ivals, R_WEIGHT_KEYS, wts["read_total"]))
+    agg.update(_wavg(ivals, W_WEIGHT_KEYS, wts["write_total"]))
+    agg.update(ivals.reindex(columns=CUMULATIVE_LAST_KEYS).ffill().iloc[-1].dropna().to_dict())
+    for side in ("read", "write"):
+        if np.isfinite(agg.get(f"{side}_unique_lines", np.nan)):
+            agg[f"{side}_unique"] = agg[f"{side}_unique_lines"]
+    agg.update(ivals.reindex(columns=MAX_KEYS).max().dropna().to_dict())
+    inst = ivals.reindex(columns=["instrs", "instructions"])
+    agg.update(np.fmax(inst.sum(), inst.ffill().iloc[-1]).to_dict())
+    return agg
+
+def parse_dynamorio(logs_dir, ts_prefix, max_workers=None):
     print(f"[parse_dynamorio] Searching logs: {logs_dir} (prefix={ts_prefix})")
     if not os.path.isdir(logs_dir):
         print("[parse_dynamorio] Logs dir not found; returning empty DataFrame.")
         return pd.DataFrame()
-    r_weight_keys = {"read_entropy", "read_local_entropy", "read_footprint90L"}
-    w_weight_keys = {"write_entropy", "write_local_entropy", "write_footprint90L"}
-    cumulative_last_keys = [
-        "reads", "writes", "bytes_read", "bytes_written",
-        "global_footprint_bytes", "read_unique_lines", "write_unique_lines",
-    ]
-    max_keys = ["read_unique", "write_unique", "uniq_lines", "uniq_pages", "footprint_bytes"]
-    found = 0
+    name_re = re.compile(rf"{re.escape(ts_prefix)}_(.+?)_instr\.rwstats\.log$")
+    paths, benchmarks = [], []
     for fname in os.listdir(logs_dir):
         if not (fname.startswith(ts_prefix) and fname.endswith("_instr.rwstats.log")):
             continue
-        m = re.match(rf"{re.escape(ts_prefix)}_(.+?)_instr\.rwstats\.log$", fname)
+        m = name_re.match(fname)
         if not m:
             continue
-        found += 1
-        benchmark = m.group(1)
-        fpath = os.path.join(logs_dir, fname)
-        ivals = []
-        try:
-            with open(fpath, "r", errors="ignore") as f:
-                for line in f:
-                    if "scope=" not in line:
-                        continue
-                    kv = _kv_from_line(line.strip())
-                    if not kv:
-                        continue
-                    sc = str(kv.get("scope", "")).lower()
-                    if sc in ("interval", "final"):
-                        ivals.append(kv)
-        except Exception:
-            continue
-        if not ivals:
-            continue
-        reads_seq = [r.get("reads", np.nan) for r in ivals]
-        writes_seq = [r.get("writes", np.nan) for r in ivals]
-        dreads = [np.nan]
-        dwrites = [np.nan]
-        for i in range(1, len(ivals)):
-            a, b = reads_seq[i-1], reads_seq[i]
-            c, d = writes_seq[i-1], writes_seq[i]
-            dreads.append((b - a) if (np.isfinite(a) and np.isfinite(b) and b >= a) else np.nan)
-            dwrites.append((d - c) if (np.isfinite(c) and np.isfinite(d) and d >= c) else np.nan)
-        r_wts, w_wts = [], []
-        for i, r in enumerate(ivals):
-            rtot = r.get("read_total", np.nan)
-            wtot = r.get("write_total", np.nan)
-            r_wts.append(rtot if np.isfinite(rtot) else dreads[i])
-            w_wts.append(wtot if np.isfinite(wtot) else dwrites[i])
-        sum_read_total = float(np.nansum([w for w in r_wts if np.isfinite(w)])) if any(np.isfinite(w) for w in r_wts) else np.nan
-        sum_write_total = float(np.nansum([w for w in w_wts if np.isfinite(w)])) if any(np.isfinite(w) for w in w_wts) else np.nan
-        agg = {"benchmark": benchmark, "scope": "aggregate"}
-        agg["read_total"] = sum_read_total
-        agg["write_total"] = sum_write_total
-        def _wavg(keys, weights):
-            den = float(np.nansum([w for w in weights if np.isfinite(w)]))
-            for k in keys:
-                num = 0.0
-                if den > 0:
-                    for i, row in enumerate(ivals):
-                        v = row.get(k, np.nan)
-                        w = weights[i]
-                        if np.isfinite(v) and np.isfinite(w) and w > 0:
-                            num += v * w
-                    agg[k] = num / den if den > 0 else np.nan
-                else:
-                    agg[k] = np.nan
-        _wavg(r_weight_keys, r_wts)
-        _wavg(w_weight_keys, w_wts)
-        for k in cumulative_last_keys:
-            for row in reversed(ivals):
-                v = row.get(k, np.nan)
-                if np.isfinite(v):
-                    agg[k] = v
-                    break
-        if np.isfinite(agg.get("read_unique_lines", np.nan)):
-            agg["read_unique"] = agg["read_unique_lines"]
-        else:
-            rmax = np.nan
-            for row in ivals:
-                v = row.get("read_unique", np.nan)
-                if np.isfinite(v):
-                    rmax = v if not np.isfinite(rmax) else max(rmax, v)
-            if np.isfinite(rmax):
-                agg["read_unique"] = rmax
-        if np.isfinite(agg.get("write_unique_lines", np.nan)):
-            agg["write_unique"] = agg["write_unique_lines"]
-        else:
-            wmax = np.nan
-            for row in ivals:
-                v = row.get("write_unique", np.nan)
-                if np.isfinite(v):
-                    wmax = v if not np.isfinite(wmax) else max(wmax, v)
-            if np.isfinite(wmax):
-                agg["write_unique"] = wmax
-        for k in max_keys:
-            vmax = np.nan
-            for row in ivals:
-                v = row.get(k, np.nan)
-                if np.isfinite(v):
-                    vmax = v if not np.isfinite(vmax) else max(vmax, v)
-            if np.isfinite(vmax):
-                agg[k] = vmax
-        for k in ("instrs", "instructions"):
-            s = float(np.nansum([row.get(k, np.nan) for row in ivals if np.isfinite(row.get(k, np.nan))]))
-            lastv = np.nan
-            for row in reversed(ivals):
-                v = row.get(k, np.nan)
-                if np.isfinite(v):
-                    lastv = v
-                    break
-            if np.isfinite(s) or np.isfinite(lastv):
-                agg[k] = max(s if np.isfinite(s) else -np.inf, lastv if np.isfinite(lastv) else -np.inf)
-        rows.append(agg)
+        paths.append(os.path.join(logs_dir, fname))
+        benchmarks.append(m.group(1))
+    found = len(paths)
+    # logs are independent; fan out across processes when there is more than one
+    if found > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            results = list(ex.map(_parse_one, paths, benchmarks))
+    else:
+        results = [_parse_one(p, b) for p, b in zip(paths, benchmarks)]
+    rows = [r for r in results if r is not None]
     print(f"[parse_dynamorio] Processed {found} files; rows={len(rows)}")
     return pd.DataFrame(rows)
 
@@ -219,18 +238,19 @@ def process_dynamorio_data(logs_dir, ts_prefix):
         "Hwg": "write_entropy",
         "Hwl": "write_local_entropy",
     }
-    feats = pd.DataFrame({"benchmark": dr["benchmark"]})
-    for out_name, src in feat_map.items():
-        feats[out_name] = pd.to_numeric(dr.get(src), errors="coerce")
-    feats = feats.set_index("benchmark")
-    feats['read_intensity'] = safe_div(feats.get('runique'), feats.get('rtotal'))
-    feats['write_intensity'] = safe_div(feats.get('wunique'), feats.get('wtotal'))
-    feats['rw_ratio_total'] = safe_div(feats.get('rtotal'), feats.get('wtotal'))
-    feats['rw_ratio_unique'] = safe_div(feats.get('runique'), feats.get('wunique'))
-    feats['rw_ratio_global_entropy'] = safe_div(feats.get('Hrg'), feats.get('Hwg'))
-    feats['rw_ratio_local_entropy'] = safe_div(feats.get('Hrl'), feats.get('Hwl'))
-    feats['rw_ratio_90_footprint'] = safe_div(feats.get('90%f_tr'), feats.get('90%f_tw'))
-    return feats
+    feats = (dr.set_index("benchmark")
+               .reindex(columns=list(feat_map.values()))
+               .apply(pd.to_numeric, errors="coerce")
+               .set_axis(list(feat_map), axis=1))
+    return feats.assign(
+        read_intensity=safe_div(feats['runique'], feats['rtotal']),
+        write_intensity=safe_div(feats['wunique'], feats['wtotal']),
+        rw_ratio_total=safe_div(feats['rtotal'], feats['wtotal']),
+        rw_ratio_unique=safe_div(feats['runique'], feats['wunique']),
+        rw_ratio_global_entropy=safe_div(feats['Hrg'], feats['Hwg']),
+        rw_ratio_local_entropy=safe_div(feats['Hrl'], feats['Hwl']),
+        rw_ratio_90_footprint=safe_div(feats['90%f_tr'], feats['90%f_tw']),
+    )
 
 def corr_heatmap(ax, matrix, row_labels, col_labels, title):
     im = ax.imshow(matrix, aspect="auto", vmin=-1, vmax=1, cmap="coolwarm")
@@ -276,10 +296,13 @@ def load_data(runid=None, force_reload=False):
     feats = process_dynamorio_data(cfg['logs_dir'], cfg['ts_prefix'])
     _cache['sniper'] = sniper
     _cache['feats'] = feats
+    _processed_cache.clear()
     return sniper, feats
 
 def get_processed(runid=None):
     sniper, feats = load_data(runid)
+    if (runid,) in _processed_cache:
+        return _processed_cache[(runid,)]
     sram = sniper[sniper["config"] == "SRAM"].set_index("benchmark")
     jans = sniper[sniper["config"] == "JanS"].set_index("benchmark")
     common = sram.index.intersection(jans.index)
@@ -302,7 +325,8 @@ def get_processed(runid=None):
     corr_df = feats.join(targets_abs, how="inner").join(ratio_targets, how="inner")
     corr_df = corr_df.loc[corr_df.index.intersection(order)]
     corr_df = corr_df.reindex(order)
-    return sram, jans, order, targets_abs, ratio_targets, corr_df, feats
+    _processed_cache[(runid,)] = (sram, jans, order, targets_abs, ratio_targets, corr_df, feats)
+    return _processed_cache[(runid,)]
 
 def plot_corr_heatmap(runid=None, out_dir=None):
     _, _, order, _, _, corr_df, _ = get_processed(runid)
@@ -337,13 +361,13 @@ def plot_grouped_bars_norm(runid=None, out_dir=None, n_benchmarks=12):
     present = [c for c in feature_cols if c in feats.columns and not feats[c].isna().all()]
     top = order[:n_benchmarks] if len(order) >= n_benchmarks else order
     bms = [b for b in top if b in feats.index]
-    df = feats.loc[bms, present].astype(float).copy()
-    for c in df.columns:
-        arr = df[c].values
-        p95 = np.nanpercentile(arr, 95) if np.isfinite(np.nanmax(arr)) else np.nan
-        denom = p95 if (np.isfinite(p95) and p95 > 0) else (np.nanmax(arr) if np.isfinite(np.nanmax(arr)) and np.nanmax(arr) > 0 else 1.0)
-        df[c] = df[c] / denom
-    df = df.clip(lower=0, upper=1.25)
+    df = feats.loc[bms, present].astype(float)
+    vals = df.to_numpy()
+    maxv = np.nanmax(vals, axis=0)
+    p95 = np.where(np.isfinite(maxv), np.nanpercentile(vals, 95, axis=0), np.nan)
+    denom = np.where(np.isfinite(p95) & (p95 > 0), p95,
+                     np.where(np.isfinite(maxv) & (maxv > 0), maxv, 1.0))
+    df = pd.DataFrame(np.clip(vals / denom, 0, 1.25), index=df.index, columns=df.columns)
     n_bm, n_feat = len(df.index), len(df.columns)
     x = np.arange(n_bm)
     width = min(0.80 / max(n_feat, 1), 0.18)
@@ -409,14 +433,24 @@ def plot_grouped_bars_raw(runid=None, out_dir=None, n_benchmarks=12):
         df.to_csv(os.path.join(out_dir, "features_grouped_bar_raw_values.csv"))
     return fig, df
 
+def _spearman_pearson(M):
+    """(Spearman, Pearson) matrices of M's columns; Spearman is Pearson on column ranks."""
+    if M.isna().to_numpy().any():
+        # pairwise-complete rows differ per column pair, so let pandas handle the masking
+        return M.corr(method="spearman"), M.corr(method="pearson")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cP = np.corrcoef(M.to_numpy(), rowvar=False)
+        cS = np.corrcoef(M.rank().to_numpy(), rowvar=False)
+    wrap = lambda c: pd.DataFrame(np.atleast_2d(c), index=M.columns, columns=M.columns)
+    return wrap(cS), wrap(cP)
+
 def plot_feature_corr_pair(runid=None, out_dir=None):
     _, _, _, _, _, _, feats = get_processed(runid)
     feature_cols = ["rtotal","wtotal","runique","wunique","90%f_tr","90%f_tw",
                     "Hrg","Hrl","Hwg","Hwl","read_intensity","write_intensity"]
     cols = [c for c in feature_cols if c in feats.columns and not feats[c].isna().all()]
     M = feats[cols].astype(float)
-    cS = M.corr(method="spearman")
-    cP = M.corr(method="pearson")
+    cS, cP = _spearman_pearson(M)
     size = max(6, 0.5 * len(cols) + 4)
     fig, axes = plt.subplots(1, 2, figsize=(2 * size + 2, size))
     im0 = corr_heatmap(axes[0], cS.values, cols, cols, "Spearman")
@@ -431,7 +465,33 @@ def plot_feature_corr_pair(runid=None, out_dir=None):
         cP.to_csv(os.path.join(out_dir, "features_vs_features_corr_pearson.csv"))
     return fig, cS, cP
 
-def plot_feature_facets(runid=None, out_dir=None, n_benchmarks=12, ncols=4, nrows=3):
+def _plot_feature_heatmap(df, label_formatter, out_dir=None, label_threshold=0.5):
+    """Features x benchmarks as one image, coloured by value / per-feature max."""
+    vals = df.to_numpy().T
+    scale = df.abs().max().to_numpy()[:, None]
+    norm = vals / np.where(scale > 0, scale, 1.0)
+    fig, ax = plt.subplots(1, 1, figsize=(max(8, 0.6 * len(df.index) + 4), max(4, 0.45 * len(df.columns) + 2)))
+    im = ax.imshow(norm, cmap="viridis", aspect="auto", vmin=0, vmax=1)
+    ax.set_xticks(np.arange(len(df.index)))
+    ax.set_xticklabels(df.index.tolist(), rotation=45, ha="right", fontsize=8)
+    ax.set_yticks(np.arange(len(df.columns)))
+    ax.set_yticklabels(df.columns.tolist(), fontsize=8)
+    # label only the cells that stand out within their feature
+    for i, j in zip(*np.nonzero(np.isfinite(vals) & (norm >= label_threshold))):
+        ax.text(j, i, label_formatter(vals[i, j]), ha="center", va="center", fontsize=7,
+                color="black" if norm[i, j] > 0.6 else "white")
+    cbar = fig.colorbar(im, ax=ax, fraction=0.035, pad=0.02)
+    cbar.set_label("value / feature max")
+    fig.suptitle(f"Per-feature values across benchmarks (raw labels) — {len(df.index)} benchmarks", y=0.995, fontsize=12)
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+    if out_dir:
+        fig.savefig(os.path.join(out_dir, "feature_facets_heatmap.png"), dpi=200, bbox_inches="tight")
+    return fig, ax
+
+def plot_feature_facets(runid=None, out_dir=None, n_benchmarks=12, ncols=4, nrows=3,
+                        facet_style="bars", label_threshold=0.5):
+    if facet_style not in ("bars", "heatmap"):
+        raise ValueError(f"facet_style must be 'bars' or 'heatmap', got {facet_style!r}")
     _, _, order, _, _, _, feats = get_processed(runid)
     feature_cols = ["rtotal", "wtotal", "runique", "wunique",
                    "read_intensity", "write_intensity",
@@ -441,6 +501,9 @@ def plot_feature_facets(runid=None, out_dir=None, n_benchmarks=12, ncols=4, nrow
     top = order[:n_benchmarks] if len(order) >= n_benchmarks else order
     bms = [b for b in top if b in feats.index]
     label_formatter = EngFormatter(places=3, sep="")
+    if facet_style == "heatmap":
+        return _plot_feature_heatmap(feats.loc[bms, present].astype(float), label_formatter,
+                                     out_dir=out_dir, label_threshold=label_threshold)
     axis_formatter = EngFormatter(places=3)
     w_per = 2.8 + 2.8 + 0.05 * len(bms)
     h_per = 2.6 + 2.6
@@ -0,0 +1,165 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# Optional native block parser for mem_metrics_unit.compute_metrics. Build in place with
+#   CFLAGS="-O3 -march=native" cythonize -i scripts/_mem_metrics_unit.pyx
+# and mem_metrics_unit.py picks it up automatically (falls back to the TRACE_RECORD regex otherwise).
+import numpy as np
+from libc.stdint cimport uint64_t, uint8_t
+
+cdef inline bint is_eol(unsigned char c) noexcept nogil:
+    # '\r' ends a line too, as text-mode universal newlines would have made it '\n'
+    return c == 10 or c == 13
+
+cdef inline bint is_ws(unsigned char c) noexcept nogil:
+    """ASCII members of TRACE_RECORD's [^\\S\\n] (space, \\t, \\v, \\f, \\x1c-\\x1f)."""
+    return c == 32 or c == 9 or c == 11 or c == 12 or 28 <= c <= 31
+
+cdef inline int hexval(unsigned char c) noexcept nogil:
+    if 48 <= c <= 57: return c - 48
+    if 97 <= c <= 102: return c - 87
+    if 65 <= c <= 70: return c - 55
+    return -1
+
+cdef inline Py_ssize_t skip_ws(const unsigned char* b, Py_ssize_t i, Py_ssize_t end) noexcept nogil:
+    while i < end and is_ws(b[i]):
+        i += 1
+    return i
+
+cdef inline Py_ssize_t parse_hex(const unsigned char* b, Py_ssize_t i, Py_ssize_t end,
+                                 uint64_t* out) noexcept nogil:
+    """Parse the hex run at b[i:]; returns the index after it, or -1 if it is empty or > 16 digits."""
+    cdef Py_ssize_t j = i
+    cdef uint64_t v = 0
+    cdef int d
+    while j < end:
+        d = hexval(b[j])
+        if d < 0:
+            break
+        v = (v << 4) | <uint64_t>d
+        j += 1
+    if j == i or j - i > 16:
+        return -1
+    out[0] = v
+    return j
+
+cdef inline Py_ssize_t find_comma(const unsigned char* b, Py_ssize_t i, Py_ssize_t end) noexcept nogil:
+    while i < end and b[i] != b',':
+        i += 1
+    return i if i < end else -1
+
+cdef int kind_word(const unsigned char* b, Py_ssize_t i, Py_ssize_t n) noexcept nogil:
+    """0 = read, 1 = write, 2 = neither, for the n-letter word at b[i:] (READ_KINDS/WRITE_KINDS)."""
+    cdef char k[5]
+    cdef Py_ssize_t j
+    if n > 5:
+        return 2
+    for j in range(n):
+        k[j] = <char>(b[i + j] | 0x20)
+    if n == 1:
+        return 0 if k[0] == b'r' else (1 if k[0] == b'w' else 2)
+    if n == 2:
+        if k[0] == b'l' and k[1] == b'd': return 0
+        if k[0] == b's' and k[1] == b't': return 1
+    if n == 4:
+        if k[0] == b'r' and k[1] == b'e' and k[2] == b'a' and k[3] == b'd': return 0
+        if k[0] == b'l' and k[1] == b'o' and k[2] == b'a' and k[3] == b'd': return 0
+    if n == 5:
+        if k[0] == b'w' and k[1] == b'r' and k[2] == b'i' and k[3] == b't' and k[4] == b'e': return 1
+        if k[0] == b's' and k[1] == b't' and k[2] == b'o' and k[3] == b'r' and k[4] == b'e': return 1
+    return 2
+
+cdef int colon_record(const unsigned char* b, Py_ssize_t i, Py_ssize_t end, uint64_t* addr) noexcept nogil:
+    """
+    TRACE_RECORD's colon branch on the line b[i:end]: -1 if it does not match (the CSV
+    branch is tried next), else kind_word's 0 / 1 / 2 with *addr set.
+    """
+    cdef Py_ssize_t j
+    i = skip_ws(b, i, end)
+    if i + 2 > end or b[i] != b'0' or b[i + 1] != b'x':
+        return -1
+    i = parse_hex(b, i + 2, end, addr)
+    if i < 0:
+        return -1
+    i = skip_ws(b, i, end)
+    if i >= end or b[i] != b':':
+        return -1
+    i = skip_ws(b, i + 1, end)
+    if i >= end or not (48 <= b[i] <= 57):
+        return -1
+    while i < end and 48 <= b[i] <= 57:
+        i += 1
+    i = skip_ws(b, i, end)
+    if i >= end or b[i] != b',':
+        return -1
+    i = skip_ws(b, i + 1, end)
+    j = i
+    while j < end and 97 <= (b[j] | 0x20) <= 122:
+        j += 1
+    if j == i:
+        return -1
+    return kind_word(b, i, j - i)
+
+cdef int csv_record(const unsigned char* b, Py_ssize_t i, Py_ssize_t end, uint64_t* addr) noexcept nogil:
+    """TRACE_RECORD's CSV branch on the line b[i:end]: 0 / 1 with *addr set, or -1."""
+    cdef Py_ssize_t c
+    cdef int kind
+    cdef unsigned char k
+    if (end - i >= 7 and b[i] == b'F' and b[i + 1] == b'o' and b[i + 2] == b'r' and b[i + 3] == b'm'
+            and b[i + 4] == b'a' and b[i + 5] == b't' and b[i + 6] == b':'):
+        return -1
+    c = find_comma(b, i, end)
+    if c < 0:
+        return -1
+    i = skip_ws(b, c + 1, end)
+    if i >= end:
+        return -1
+    k = b[i] | 0x20
+    kind = 0 if k == b'r' else (1 if k == b'w' else -1)
+    if kind < 0:
+        return -1
+    c = find_comma(b, i + 1, end)
+    if c < 0:
+        return -1
+    c = find_comma(b, c + 1, end)
+    if c < 0:
+        return -1
+    i = skip_ws(b, c + 1, end)
+    if i + 1 < end and b[i] == b'0' and (b[i + 1] | 0x20) == b'x':
+        i += 2
+    i = parse_hex(b, i, end, addr)
+    if i < 0:
+        return -1
+    i = skip_ws(b, i, end)
+    if i < end and b[i] != b',':
+        return -1
+    return kind
+
+def parse_block(const unsigned char[::1] buf):
+    """Same (addr uint64, is_write bool) arrays as mem_metrics_unit.parse_block, from raw bytes."""
+    cdef Py_ssize_t size = buf.shape[0], start = 0, end, n = 0, nlines = 1, i
+    cdef const unsigned char* b
+    cdef uint64_t a = 0
+    cdef int kind
+    if size == 0:
+        return np.zeros(0, np.uint64), np.zeros(0, bool)
+    b = &buf[0]
+    with nogil:
+        for i in range(size):
+            nlines += is_eol(b[i])
+    addr = np.empty(nlines, np.uint64)
+    write = np.empty(nlines, np.uint8)
+    cdef uint64_t[::1] av = addr
+    cdef uint8_t[::1] wv = write
+    with nogil:
+        while start <= size:
+            end = start
+            while end < size and not is_eol(b[end]):
+                end += 1
+            kind = colon_record(b, start, end, &a)
+            if kind < 0:
+                kind = csv_record(b, start, end, &a)
+            if kind == 0 or kind == 1:
+                av[n] = a
+                wv[n] = kind
+                n += 1
+            start = end + 1
+    return addr[:n], write[:n].view(bool)
@@ -0,0 +1,234 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# Optional native backend for mem_metrics_v3.compute_metrics. Build in place with
+#   CFLAGS="-O3 -march=native" cythonize -i scripts/archives/_mem_metrics.pyx
+# and mem_metrics_v3.py picks it up automatically (falls back to NumPy/numba otherwise).
+import mmap, os
+from libc.stdint cimport uint64_t, int64_t
+from libc.stdlib cimport malloc, realloc, free, qsort
+from libc.math cimport log2
+from libc.string cimport memcmp
+
+cdef struct Vec:
+    uint64_t* data
+    Py_ssize_t n
+    Py_ssize_t cap
+
+cdef int push(Vec* v, uint64_t x) nogil:
+    cdef uint64_t* d
+    if v.n == v.cap:
+        v.cap = v.cap * 2 if v.cap else 1 << 16
+        d = <uint64_t*>realloc(v.data, v.cap * sizeof(uint64_t))
+        if d == NULL:
+            return -1
+        v.data = d
+    v.data[v.n] = x
+    v.n += 1
+    return 0
+
+cdef int cmp_u64(const void* a, const void* b) noexcept nogil:
+    cdef uint64_t x = (<uint64_t*>a)[0], y = (<uint64_t*>b)[0]
+    return (x > y) - (x < y)
+
+cdef int cmp_u64_desc(const void* a, const void* b) noexcept nogil:
+    return cmp_u64(b, a)
+
+cdef inline bint is_ws(unsigned char c) nogil:
+    return c == 32 or (9 <= c <= 13)
+
+cdef inline int hexval(unsigned char c) nogil:
+    if 48 <= c <= 57: return c - 48
+    if 97 <= c <= 102: return c - 87
+    if 65 <= c <= 70: return c - 55
+    return -1
+
+cdef inline Py_ssize_t parse_hex(const unsigned char* b, Py_ssize_t i, Py_ssize_t end,
+                                 uint64_t* out) nogil:
+    """Parse hex digits at b[i:]; returns the index after them, or -1 if none / > 16."""
+    cdef Py_ssize_t j = i
+    cdef uint64_t v = 0
+    cdef int d
+    while j < end:
+        d = hexval(b[j])
+        if d < 0:
+            break
+        v = (v << 4) | <uint64_t>d
+        j += 1
+    if j == i or j - i > 16:
+        return -1
+    out[0] = v
+    return j
+
+cdef inline Py_ssize_t skip_ws(const unsigned char* b, Py_ssize_t i, Py_ssize_t end) nogil:
+    while i < end and is_ws(b[i]):
+        i += 1
+    return i
+
+cdef int kind_of(const unsigned char* b, Py_ssize_t i, Py_ssize_t end) nogil:
+    """0 = read, 1 = write, -1 = neither, for the letter run at b[i:] (LINE_COLON's KIND); -2 if empty."""
+    cdef char k[8]
+    cdef Py_ssize_t n = 0
+    cdef unsigned char c
+    while i < end:
+        c = b[i] | 0x20
+        if not (97 <= c <= 122):
+            break
+        if n == 6:          # longer than any known kind
+            return -1
+        k[n] = <char>c
+        n += 1
+        i += 1
+    if n == 0:
+        return -2
+    if n == 1:
+        return 0 if k[0] == b'r' else (1 if k[0] == b'w' else -1)
+    if n == 2:
+        if k[0] == b'l' and k[1] == b'd': return 0
+        if k[0] == b's' and k[1] == b't': return 1
+    if n == 4:
+        if k[0] == b'r' and k[1] == b'e' and k[2] == b'a' and k[3] == b'd': return 0
+        if k[0] == b'l' and k[1] == b'o' and k[2] == b'a' and k[3] == b'd': return 0
+    if n == 5:
+        if k[0] == b'w' and k[1] == b'r' and k[2] == b'i' and k[3] == b't' and k[4] == b'e': return 1
+        if k[0] == b's' and k[1] == b't' and k[2] == b'o' and k[3] == b'r' and k[4] == b'e': return 1
+    return -1
+
+cdef int parse_colon(const unsigned char* b, Py_ssize_t i, Py_ssize_t end, uint64_t* addr) nogil:
+    """
+    "0xADDR: SIZE, KIND" -> kind (0/1) with *addr set, -1 for a matching line with an
+    unknown KIND (dropped), or -2 if the line is not in this form (tried as CSV).
+    """
+    i = skip_ws(b, i, end)
+    if i + 2 > end or b[i] != b'0' or b[i + 1] != b'x':
+        return -2
+    i = parse_hex(b, i + 2, end, addr)
+    if i < 0:
+        return -2
+    i = skip_ws(b, i, end)
+    if i >= end or b[i] != b':':
+        return -2
+    i = skip_ws(b, i + 1, end)
+    if i >= end or not (48 <= b[i] <= 57):
+        return -2
+    while i < end and 48 <= b[i] <= 57:
+        i += 1
+    i = skip_ws(b, i, end)
+    if i >= end or b[i] != b',':
+        return -2
+    return kind_of(b, skip_ws(b, i + 1, end), end)
+
+cdef int parse_csv(const unsigned char* b, Py_ssize_t i, Py_ssize_t end, uint64_t* addr) nogil:
+    """"instr_addr,r/w,size,data_addr[,...]" -> kind (0/1) with *addr set, or -1."""
+    cdef Py_ssize_t c[3]
+    cdef int n = 0, kind
+    cdef Py_ssize_t j = i, lo, hi
+    cdef unsigned char k
+    while j < end and n < 3:
+        if b[j] == b',':
+            c[n] = j
+            n += 1
+        j += 1
+    if n < 3:
+        return -1
+    lo = skip_ws(b, c[0] + 1, c[1])
+    if lo >= c[1]:
+        return -1
+    k = b[lo] | 0x20
+    kind = 0 if k == b'r' else (1 if k == b'w' else -1)
+    if kind < 0:
+        return -1
+    lo = skip_ws(b, c[2] + 1, end)
+    hi = lo
+    while hi < end and b[hi] != b',':
+        hi += 1
+    while hi > lo and is_ws(b[hi - 1]):
+        hi -= 1
+    if hi - lo >= 2 and b[lo] == b'0' and (b[lo + 1] | 0x20) == b'x':
+        lo += 2
+    if parse_hex(b, lo, hi, addr) != hi:
+        return -1
+    return kind
+
+cdef tuple side_metrics(Vec* v, int M):
+    """(total, unique, entropy, local_entropy, footprint90) of one access stream (sorts v)."""
+    cdef Py_ssize_t n = v.n, i, j, u = 0
+    cdef double H = 0.0, Hl = 0.0, p, need
+    cdef int64_t* counts
+    cdef int64_t acc = 0
+    cdef Py_ssize_t f90 = 0
+    if n == 0:
+        return 0, 0, 0.0, 0.0, 0
+    qsort(v.data, n, sizeof(uint64_t), cmp_u64)
+    counts = <int64_t*>malloc(n * sizeof(int64_t))
+    if counts == NULL:
+        raise MemoryError()
+    i = 0
+    while i < n:
+        j = i + 1
+        while j < n and v.data[j] == v.data[i]:
+            j += 1
+        counts[u] = j - i
+        p = <double>(j - i) / n
+        H -= p * log2(p)
+        u += 1
+        i = j
+    i = 0
+    while i < n:            # a >> M keeps the sorted order, so local keys are runs too
+        j = i + 1
+        while j < n and (v.data[j] >> M) == (v.data[i] >> M):
+            j += 1
+        p = <double>(j - i) / n
+        Hl -= p * log2(p)
+        i = j
+    qsort(counts, u, sizeof(int64_t), cmp_u64_desc)
+    need = 0.9 * n
+    while f90 < u:
+        acc += counts[f90]
+        f90 += 1
+        if acc >= need:
+            break
+    free(counts)
+    return n, u, H, Hl, f90
+
+def compute_metrics(path, int M):
+    """Same 10 metrics as mem_metrics_v3.compute_metrics, parsed and reduced in C."""
+    cdef Vec R, W
+    cdef const unsigned char[::1] buf
+    cdef const unsigned char* b
+    cdef Py_ssize_t size, start = 0, end
+    cdef uint64_t addr = 0
+    cdef int kind, rc = 0
+    R.data = NULL; R.n = 0; R.cap = 0
+    W.data = NULL; W.n = 0; W.cap = 0
+    try:
+        if os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = mm
+            b = &buf[0]
+            size = buf.shape[0]
+            with nogil:
+                while start < size and rc == 0:
+                    end = start
+                    while end < size and b[end] != b'\n':
+                        end += 1
+                    kind = parse_colon(b, start, end, &addr)
+                    if kind == -2 and not (end - start >= 7 and memcmp(b + start, b"Format:", 7) == 0):
+                        kind = parse_csv(b, start, end, &addr)
+                    if kind == 0:
+                        rc = push(&R, addr)
+                    elif kind == 1:
+                        rc = push(&W, addr)
+                    start = end + 1
+            del buf
+            mm.close()
+            if rc != 0:
+                raise MemoryError()
+        m = {}
+        for side, stats in (("read", side_metrics(&R, M)), ("write", side_metrics(&W, M))):
+            n, u, H, Hl, f90 = stats
+            m.update({f"{side}_total": n, f"{side}_unique": u, f"{side}_entropy": H,
+                      f"{side}_local_entropy": Hl, f"{side}_footprint90": f90})
+        return m
+    finally:
+        free(R.data)
+        free(W.data)
@@ -1,82 +1,260 @@
 #!/usr/bin/env python3
-import argparse, re, math, os
-from collections import Counter
+import argparse, re, os, mmap
+import numpy as np
 
-def entropy(counter):
-    total = sum(counter.values())
+# numba fuses sort + histogram + entropy/footprint into one compiled pass when present
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# native parser + reducer, built with: cythonize -i scripts/archives/_mem_metrics.pyx
+try:
+    import _mem_metrics
+except ImportError:
+    _mem_metrics = None
+
+# fastmath without nnan/ninf: lets LLVM vectorize the log2 reductions but keeps NaN/inf semantics
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+def entropy_np(counts):
+    """Shannon entropy (bits) of a count array with no zero entries (np.unique output)."""
+    total = counts.sum()
     if total == 0: return 0.0
-    H = 0.0
-    for c in counter.values():
-        p = c / total
-        H -= p * math.log2(p)
-    return H
-
-def footprint90(counter):
-    total = sum(counter.values())
-    if total == 0: return 0
-    need = 0.9 * total
-    acc = 0; cnt = 0
-    for _, c in counter.most_common():
-        acc += c; cnt += 1
-        if acc >= need: break
-    return cnt
+    p = counts.astype(np.float64) / total
+    return float(-np.dot(p, np.log2(p)))
+
+def footprint90_np(counts):
+    """Fewest keys covering >= 90% of accesses: one sort + cumsum + binary search."""
+    if counts.size == 0: return 0
+    cs = np.cumsum(np.sort(counts)[::-1])
+    return int(np.searchsorted(cs, 0.9 * cs[-1], side='left') + 1)
+
+def histogram(addr):
+    """Per-key access counts of a uint64 address array (order irrelevant to the metrics)."""
+    return np.unique(addr, return_counts=True)[1]
 
 # regex for "0xADDR: SIZE, KIND" style
 LINE_COLON = re.compile(r'^\s*(0x[0-9a-fA-F]+)\s*:\s*(\d+)\s*,\s*([A-Za-z]+)')
 
+READ_KINDS  = [b'r', b'read', b'load', b'ld', b'mem-read']
+WRITE_KINDS = [b'w', b'write', b'store', b'st', b'mem-write']
+
+HEX_WIDTH  = 19   # "0x" + 16 digits, plus one column so over-long tokens show up as invalid
+KIND_WIDTH = 16
+SIZE_WIDTH = 20
+CHUNK_BYTES = 1 << 24   # traces are scanned in ~16 MB newline-aligned slices of the mmap
+
+_HEX_LUT = np.full(256, 255, dtype=np.uint8)
+_HEX_LUT[np.frombuffer(b'0123456789abcdef', dtype=np.uint8)] = np.arange(16)
+_HEX_LUT[np.frombuffer(b'ABCDEF', dtype=np.uint8)] = np.arange(10, 16)
+_IS_WS = np.zeros(256, dtype=bool);    _IS_WS[list(b' \t\r\v\f\n')] = True
+_IS_ALPHA = np.zeros(256, dtype=bool); _IS_ALPHA[list(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')] = True
+_IS_DIGIT = np.zeros(256, dtype=bool); _IS_DIGIT[list(b'0123456789')] = True
+
+def _gather(data, starts, ends, width):
+    """(n, width) uint8 matrix of data[starts:ends], left-aligned and NUL-padded."""
+    idx = starts[:, None] + np.arange(width)
+    live = idx < ends[:, None]
+    return np.where(live, data[np.minimum(idx, data.size - 1)], 0).astype(np.uint8, copy=False)
+
+def parse_hex(mat):
+    """
+    Vectorized int(tok, 16) over a (n, width) matrix of NUL-padded tokens with an
+    optional 0x prefix. Returns (uint64 values, valid mask); tokens with non-hex
+    characters or more than 16 digits are invalid.
+    """
+    n, width = mat.shape
+    digit = _HEX_LUT[mat]
+    live = mat != 0
+    pre = (mat[:, 0] == ord('0')) & ((mat[:, 1] | 0x20) == ord('x'))
+    digit[pre, 1] = 0
+    ndig = live.sum(axis=1) - 2 * pre
+    valid = ~((digit == 255) & live).any(axis=1) & (ndig >= 1) & (ndig <= 16)
+    vals = np.zeros(n, dtype=np.uint64)
+    for j in range(width):
+        vals = np.where(live[:, j], vals * np.uint64(16) + digit[:, j], vals)
+    return vals, valid
+
+def _positions(buf, byte):
+    """Sorted offsets of `byte` in buf, with a buf.size sentinel so lookups never run off the end."""
+    return np.append(np.flatnonzero(buf == byte), buf.size)
+
+def _next(pos, at):
+    """First offset in pos (from _positions) at or after each `at`."""
+    return pos[np.minimum(np.searchsorted(pos, at), pos.size - 1)]
+
+def _strip(nonws, lo, hi):
+    """Narrow each [lo, hi) span to its non-whitespace extent (empty spans end with lo >= hi)."""
+    lo2 = np.minimum(_next(nonws, lo), hi)
+    j = np.searchsorted(nonws, hi) - 1
+    hi2 = np.where(j >= 0, nonws[np.maximum(j, 0)] + 1, lo2)
+    return lo2, np.maximum(hi2, lo2)
+
+def _token(buf, lo, hi, width):
+    """(n, width) matrix of the spans, plus a mask of spans that fit in width."""
+    return _gather(buf, lo, hi, width), (hi - lo <= width)
+
+def _split_lines(buf):
+    nl = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], nl + 1))
+    ends = np.append(nl, buf.size)
+    keep = starts < ends            # blank lines carry no record
+    return starts[keep], ends[keep]
+
+def _parse_colon(buf, starts, ends, nonws):
+    """
+    Vectorized LINE_COLON over the lines of one slice: "0xADDR: SIZE, KIND".
+    Returns (addr, is_write, keep, matched); matched marks every line LINE_COLON
+    accepts, including opcode kinds that are dropped rather than tried as CSV.
+    """
+    colon = _next(_positions(buf, ord(':')), starts)
+    comma = _next(_positions(buf, ord(',')), colon)
+    ok = (colon < ends) & (comma < ends)
+
+    a_lo, a_hi = _strip(nonws, starts, colon)
+    mat, fits = _token(buf, a_lo, a_hi, HEX_WIDTH)
+    addr, valid = parse_hex(mat)
+    ok &= fits & valid & (mat[:, 0] == ord('0')) & (mat[:, 1] == ord('x'))
+
+    s_lo, s_hi = _strip(nonws, colon + 1, comma)
+    mat, fits = _token(buf, s_lo, s_hi, SIZE_WIDTH)
+    ok &= fits & (s_hi > s_lo) & (_IS_DIGIT[mat] | (mat == 0)).all(axis=1)
+
+    # KIND is the run of letters after the comma; anything past the run is cut off
+    k_lo = np.minimum(_next(nonws, comma + 1), ends)
+    mat, _ = _token(buf, k_lo, ends, KIND_WIDTH)
+    alpha = _IS_ALPHA[mat]
+    run = np.where(alpha.all(axis=1), KIND_WIDTH, np.argmin(alpha, axis=1))
+    mat = np.where(np.arange(KIND_WIDTH) < run[:, None], mat | 0x20, 0).astype(np.uint8)
+    kind = mat.view(f'S{KIND_WIDTH}').ravel()
+    is_r = np.isin(kind, READ_KINDS)
+    is_w = np.isin(kind, WRITE_KINDS)   # anything else is an opcode like mov/push: ignore
+    matched = ok & (run > 0)
+    return addr, is_w, matched & (run < KIND_WIDTH) & (is_r | is_w), matched
+
+def _parse_csv(buf, starts, ends, nonws):
+    """Vectorized split over the lines of one slice: "instr_addr,r/w,size,data_addr[,...]"."""
+    commas = _positions(buf, ord(','))
+    i = np.searchsorted(commas, starts)
+    c = [commas[np.minimum(i + k, commas.size - 1)] for k in range(4)]   # first four commas
+    ok = c[2] < ends                    # at least four fields
+    c4 = np.minimum(c[3], ends)
+
+    k_lo, k_hi = _strip(nonws, c[0] + 1, c[1])
+    k = buf[np.minimum(k_lo, buf.size - 1)] | 0x20
+    is_r = (k_hi > k_lo) & (k == ord('r'))
+    is_w = (k_hi > k_lo) & (k == ord('w'))
+
+    a_lo, a_hi = _strip(nonws, c[2] + 1, c4)
+    mat, fits = _token(buf, a_lo, a_hi, HEX_WIDTH)
+    addr, valid = parse_hex(mat)
+    return addr, is_w, ok & fits & valid & (is_r | is_w)
+
+_FORMAT = np.frombuffer(b'Format:', dtype=np.uint8)
+
+def parse_slice(buf):
+    """
+    (addr, is_write) for every record in one slice, decided per line as the line loop
+    did: headers are skipped, a line LINE_COLON accepts is final, anything else is
+    tried as CSV. Traces mixing both forms (or with a stray first line) keep all rows.
+    """
+    starts, ends = _split_lines(buf)
+    nonws = np.append(np.flatnonzero(~_IS_WS[buf]), buf.size)
+    header = (_gather(buf, starts, ends, _FORMAT.size) == _FORMAT).all(axis=1)
+    c_addr, c_w, c_keep, colon = _parse_colon(buf, starts, ends, nonws)
+    v_addr, v_w, v_keep = _parse_csv(buf, starts, ends, nonws)
+    c_keep &= ~header
+    v_keep &= ~(header | colon)
+    return (np.concatenate((c_addr[c_keep], v_addr[v_keep])),
+            np.concatenate((c_w[c_keep], v_w[v_keep])))
+
+def _slices(mm, buf):
+    """Newline-aligned views of buf of roughly CHUNK_BYTES each."""
+    i = 0
+    while i < buf.size:
+        j = mm.find(b'\n', min(i + CHUNK_BYTES, buf.size))
+        j = buf.size if j < 0 else j + 1
+        yield buf[i:j]
+        i = j
+
+def read_events(path):
+    """Return (addr uint64, is_write bool) arrays for every read/write record in the trace."""
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, np.uint64), np.zeros(0, bool)
+    # "0xADDR: SIZE, KIND" (memtrace_simple, older text) or "instr_addr,r/w,size,data_addr" (your deepsjeng log)
+    addrs, writes = [], []
+    with open(path, 'rb') as f:
+        # left for GC to unmap: np.frombuffer views keep the mapping exported until dropped
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    for part in _slices(mm, buf):
+        a, w = parse_slice(part)
+        addrs.append(a); writes.append(w)
+    return np.concatenate(addrs), np.concatenate(writes)
+
+if njit is not None:
+    @njit(cache=True)
+    def _runs(keys):
+        """Run lengths of a sorted key array, i.e. per-key counts."""
+        out = np.empty(keys.size, np.int64)
+        k = 0; i = 0
+        while i < keys.size:
+            j = i + 1
+            while j < keys.size and keys[j] == keys[i]:
+                j += 1
+            out[k] = j - i; k += 1; i = j
+        return out[:k]
+
+    @njit(parallel=True, fastmath=FASTMATH, cache=True)
+    def _side_kernel(addr, M):
+        """(total, unique, entropy, local_entropy, footprint90) of one access stream."""
+        n = addr.size
+        if n == 0:
+            return 0, 0, 0.0, 0.0, 0
+        a = np.sort(addr)
+        c = _runs(a)
+        cl = _runs(a >> M)          # shifting is monotone, so a >> M is still sorted
+        H = 0.0
+        for i in prange(c.size):
+            p = c[i] / n
+            H -= p * np.log2(p)
+        Hl = 0.0
+        for i in prange(cl.size):
+            p = cl[i] / n
+            Hl -= p * np.log2(p)
+        cs = np.cumsum(np.sort(c)[::-1])
+        return n, c.size, H, Hl, np.searchsorted(cs, 0.9 * n) + 1
+
+def _compute_metrics_jit(r, w, M):
+    m = {}
+    for side, a in (("read", r), ("write", w)):
+        n, u, H, Hl, f90 = _side_kernel(a, np.uint64(M))
+        m.update({f"{side}_total": int(n), f"{side}_unique": int(u), f"{side}_entropy": float(H),
+                  f"{side}_local_entropy": float(Hl), f"{side}_footprint90": int(f90)})
+    return m
+
 def compute_metrics(path, M):
-    R = Counter(); W = Counter(); Rloc = Counter(); Wloc = Counter()
-    with open(path, 'r', errors='ignore') as f:
-        for line in f:
-            if not line.strip() or line.startswith('Format:'):  # skip headers/blanks
-                continue
-            kind = None
-            addr = None
-
-            # Try "0xADDR: SIZE, KIND" (memtrace_simple, older text)
-            m = LINE_COLON.match(line)
-            if m:
-                addr = int(m.group(1), 16)
-                k = m.group(3).lower()
-                if k in ('r','read','load','ld','mem-read'):
-                    kind = 'R'
-                elif k in ('w','write','store','st','mem-write'):
-                    kind = 'W'
-                else:
-                    kind = None  # opcode like mov/push/etc: ignore
-            else:
-                # Try CSV-ish "instr_addr,r/w,size,data_addr" (your deepsjeng log)
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 4:
-                    k = parts[1].lower()
-                    if k.startswith('r'): kind = 'R'
-                    elif k.startswith('w'): kind = 'W'
-                    if kind:
-                        # data addr is the 4th field
-                        try:
-                            addr = int(parts[3], 16)
-                        except ValueError:
-                            addr = None
-
-            if kind and addr is not None:
-                if kind == 'R':
-                    R[addr] += 1
-                    Rloc[addr >> M] += 1
-                else:
-                    W[addr] += 1
-                    Wloc[addr >> M] += 1
+    if _mem_metrics is not None:
+        return _mem_metrics.compute_metrics(path, M)
+    addr, is_write = read_events(path)
+    r, w = addr[~is_write], addr[is_write]
+    if njit is not None:
+        return _compute_metrics_jit(r, w, M)
+    R = histogram(r); W = histogram(w)
+    Rloc = histogram(r >> np.uint64(M)); Wloc = histogram(w >> np.uint64(M))
 
     return {
-        "read_total": sum(R.values()),
+        "read_total": int(R.sum()),
         "read_unique": len(R),
-        "read_entropy": entropy(R),
-        "read_local_entropy": entropy(Rloc),
-        "read_footprint90": footprint90(R),
-        "write_total": sum(W.values()),
+        "read_entropy": entropy_np(R),
+        "read_local_entropy": entropy_np(Rloc),
+        "read_footprint90": footprint90_np(R),
+        "write_total": int(W.sum()),
         "write_unique": len(W),
-        "write_entropy": entropy(W),
-        "write_local_entropy": entropy(Wloc),
-        "write_footprint90": footprint90(W),
+        "write_entropy": entropy_np(W),
+        "write_local_entropy": entropy_np(Wloc),
+        "write_footprint90": footprint90_np(W),
     }
 
 def append_csv(csv_path, name, M, m):
@@ -15,17 +15,26 @@ What this script does:
 
 Usage:
   python3 scripts/energy_ed2p_v3.py <sram_simout> <jans_simout>
+  python3 scripts/energy_ed2p_v3.py --pairs pairs.txt [-j N]   # one "<sram><TAB><jans>" per line
 
 Notes:
   * Energy scope is LLC-only (nJ/event + W leakage).
+  * Parsed sim.out / sqlite / sim.cfg results are cached in hidden JSON sidecars in each
+    run dir (and per pair in output_<bench>/), keyed on the inputs' (mtime_ns, size);
+    pass --no-cache to bypass them.
 """
 
 import argparse
-import csv
+import functools
+import json
+import math
+import mmap
 import os
 import re
-import sqlite3
-from datetime import datetime, timezone
+import stat
+
+# sqlite3, datetime and the thread / process pools are imported where first used,
+# so the common one-pair run (often launched per bench from a shell loop) skips their cost.
 
 # =========================
 # Defaults (fallback if sim.cfg has no overrides)
@@ -39,83 +48,254 @@ JANS_DEFAULT = dict(E_hit_nJ=0.188, E_miss_nJ=0.077, E_write_nJ=2.305, P_leak_W=
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
-def infer_bench_root_from_run_dir(run_dir):
+_RE_CFG_SUFFIX = re.compile(r'_(sram|jans)[^/]*', re.IGNORECASE)
+_RE_NM_SUFFIX  = re.compile(r'_(\d+)M$')
+
+@functools.lru_cache(maxsize=None)
+def parse_run_dir(run_dir):
     """
-    results/541_leela_r_sram_100M -> results/output_541_leela_r
-    results/541_leela_r_JanS_cap_approx_100M -> results/output_541_leela_r
+    (bench_name, n_m, out_dir) from one run dir, e.g.
+    results/541_leela_r_sram_100M -> ("541_leela_r", "100", results/output_541_leela_r)
+    results/541_leela_r_JanS_cap_approx_100M -> ("541_leela_r", "100", results/output_541_leela_r)
     """
-    results_root = os.path.dirname(run_dir)
-    base = os.path.basename(run_dir)
-    base = re.sub(r'_(sram|jans)[^/]*', '', base, flags=re.IGNORECASE)
-    base = re.sub(r'_\d+M$', '', base)
-    return os.path.join(results_root, f"output_{base}")
-
-def extract_bench_name_and_nm(run_dir):
     leaf = os.path.basename(run_dir)
-    bench = re.sub(r'_(sram|jans)[^/]*', '', leaf, flags=re.IGNORECASE)
-    m = re.search(r'_(\d+)M$', leaf)
+    m = _RE_NM_SUFFIX.search(leaf)
     n_m = m.group(1) if m else None
-    bench = re.sub(r'_\d+M$', '', bench)
-    return bench, n_m
+    # The config suffix runs to the end of the leaf, so both strips are plain slices
+    c = _RE_CFG_SUFFIX.search(leaf)
+    if c:
+        bench = leaf[:c.start()]
+        m = _RE_NM_SUFFIX.search(bench)
+    else:
+        bench = leaf
+    if m:
+        bench = bench[:m.start()]
+    return bench, n_m, os.path.join(os.path.dirname(run_dir), f"output_{bench}")
+
+# =========================
+# Sidecar caches
+# =========================
+_CACHE_VERSION = 2   # bump when a cached reader's output changes
+_USE_CACHE = True
+
+def _set_use_cache(on):
+    """Turn the sidecar caches on/off in this process (also each batch worker's initializer)."""
+    global _USE_CACHE
+    _USE_CACHE = on
+
+def _stat_key(paths):
+    key = [_CACHE_VERSION]
+    for p in paths:
+        try:
+            st = os.stat(p)
+            key.append([p, st.st_mtime_ns, st.st_size])
+        except OSError:
+            key.append([p, None, None])
+    return key
+
+def _run_files(*names):
+    return lambda run_dir: [os.path.join(run_dir, n) for n in names]
+
+def _sidecar_cached(name, inputs, where=None):
+    """
+    Cache a reader's (JSON-able) result in a sidecar <name> next to its first input file
+    (or in the directory where(arg), created if missing). inputs(arg) lists the files the
+    result depends on; the entry is reused while all of their (mtime_ns, size) are
+    unchanged. The key is
+    re-taken after the read and nothing is stored if an input changed under it, so a
+    sidecar never pairs a result with the wrong file state. Sidecars that cannot be
+    written are skipped.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(arg):
+            if not _USE_CACHE:
+                return fn(arg)
+            paths = inputs(arg)
+            side = os.path.join(where(arg) if where else os.path.dirname(paths[0]), name)
+            key = _stat_key(paths)
+            try:
+                with open(side, "r") as f:
+                    hit = json.load(f)
+                if hit.get("key") == key:
+                    return hit["value"]
+            except (OSError, ValueError, AttributeError):
+                pass
+            val = fn(arg)
+            if _stat_key(paths) != key:
+                return val
+            tmp = f"{side}.{os.getpid()}.tmp"
+            try:
+                try:
+                    f = open(tmp, "w")
+                except FileNotFoundError:   # where() may name a dir not created yet (output_<bench>)
+                    ensure_dir(os.path.dirname(side))
+                    f = open(tmp, "w")
+                with f:
+                    json.dump({"key": key, "value": val}, f)
+                os.replace(tmp, side)
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return val
+        return wrapper
+    return deco
 
 # =========================
 # Parsing helpers (sim.out)
 # =========================
-def _read_text(path):
+def _map_file(path, quiet=False):
+    """Read-only mmap of path (b"" if empty or unreadable); callers close it via _unmap."""
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     except Exception as e:
-        print(f"[WARN] Cannot read {path}: {e}")
-        return ""
-
-def _first_num_after_pipe(t, label_regex):
-    m = re.search(label_regex + r'\s*\|\s*([0-9.]+)', t, flags=re.IGNORECASE | re.M)
-    return m.group(1) if m else None
-
+        if not quiet:
+            print(f"[WARN] Cannot read {path}: {e}")
+        return b""
+
+def _unmap(buf):
+    if isinstance(buf, mmap.mmap):
+        buf.close()
+
+def _group(m, i=1):
+    return m.group(i).decode("ascii") if m else None
+
+# Sniper prints every stat as "label | value [| value ...]" with fixed-case labels. Labels
+# are looked up exactly as Sniper spells them, with whitespace removed (no case folding).
+_RE_LINE   = re.compile(rb'^([^|\n]*)(?:\|([^\n]*))?$', re.M)
+_RE_INT    = re.compile(rb'\s*([0-9,]+)')
+_RE_DIGITS = re.compile(rb'\s*([0-9]+)')
+_RE_PCT    = re.compile(rb'\s*([0-9.]+)\s*%')
+_RE_LAT    = re.compile(rb'\s*([0-9.]+)\s*([a-zA-Z]*)')
+
+_NUM_CHARS = b"0123456789."
+
+def _lead(value, chars=_NUM_CHARS):
+    """Leading run of `chars` after any whitespace (a regex match of ws* [0-9.]+), or None."""
+    tok = value.lstrip()
+    n = len(tok) - len(tok.lstrip(chars))
+    return tok[:n].decode("ascii") if n else None
+
+# Top-level scalars need no regex: the first numeric run after "|" is taken with _lead()
+_TOP_FIELDS = {
+    b"Instructions": "instructions",
+    b"Cycles":       "cycles",
+    b"IPC":          "ipc",
+    b"Time(ns)":     "time_ns",
+}
+_L3_FIELDS = {
+    b"numcacheaccess":   ("l3_acc", _RE_INT),
+    b"numcacheaccesses": ("l3_acc", _RE_INT),
+    b"numcachemiss":     ("l3_miss", _RE_INT),
+    b"numcachemisses":   ("l3_miss", _RE_INT),
+    b"missrate":         ("l3_miss_rate_pct", _RE_PCT),
+}
+_DRAM_FIELDS = {
+    b"numdramaccesses": ("dram_acc", _RE_DIGITS),
+    b"numdramrequests": ("dram_acc", _RE_DIGITS),
+}
+_DRAM_LAT_LABEL = b"averagedramaccesslatency"
+_SIMOUT_KEYS = ("instructions", "cycles", "ipc", "time_ns",
+                "l3_acc", "l3_miss", "l3_miss_rate_pct",
+                "dram_acc", "dram_lat_value", "dram_lat_unit")
+
+def _label_lines(buf, pos=0, endpos=None):
+    """Yield (normalized label, value bytes or None) for each line of buf[pos:endpos]."""
+    for m in _RE_LINE.finditer(buf, pos, len(buf) if endpos is None else endpos):
+        label, value = m.groups()
+        yield b"".join(label.split()), value
+
+def _find_header(buf, needle, pos=0):
+    """
+    (line_start, body_start) of the first section header at/after pos whose label is
+    `needle`, located with buf.find(needle); (-1, -1) if there is none.
+    """
+    key = b"".join(needle.split())
+    while True:
+        i = buf.find(needle, pos)
+        if i < 0:
+            return -1, -1
+        ls = buf.rfind(b"\n", 0, i) + 1
+        le = buf.find(b"\n", i)
+        le = len(buf) if le < 0 else le
+        label = buf[ls:le].split(b"|", 1)[0]
+        if b"".join(label.split()) == key:
+            return ls, le + 1
+        pos = i + len(needle)
+
+_SIMOUT_TAIL = 1 << 17   # Sniper prints the cache/DRAM summaries at the end of sim.out
+
+def _find_header_tail(buf, needle):
+    """_find_header over the last _SIMOUT_TAIL bytes of buf, then over all of it."""
+    if len(buf) > _SIMOUT_TAIL:
+        hit = _find_header(buf, needle, len(buf) - _SIMOUT_TAIL)
+        if hit[0] >= 0:
+            return hit
+    return _find_header(buf, needle)
+
+@functools.lru_cache(maxsize=None)
+@_sidecar_cached(".sim_parsed.json", lambda path: [path])
 def parse_simout_full(path):
     """
     Parse a Sniper sim.out for compact summary fields.
-    Returns: (dict[str,str], raw_text)
-    """
-    t = _read_text(path)
-    out = dict()
-
-    out["instructions"] = _first_num_after_pipe(t, r'^\s*Instructions')
-    out["cycles"]       = _first_num_after_pipe(t, r'^\s*Cycles')
-    out["ipc"]          = _first_num_after_pipe(t, r'^\s*IPC')
-    out["time_ns"]      = _first_num_after_pipe(t, r'^\s*Time\s*\(ns\)')
-
-    blk = re.search(r'Cache\s+L3\s*\|(?P<body>.*?)(?=\n\s*DRAM\s+summary\s*\||\Z)',
-                    t, flags=re.IGNORECASE | re.S)
-    if blk:
-        body = blk.group('body')
-        m_acc = re.search(r'num\s+cache\s+access(?:es)?\s*\|\s*([0-9,]+)', body, flags=re.IGNORECASE)
-        m_mis = re.search(r'num\s+cache\s+miss(?:es)?\s*\|\s*([0-9,]+)',   body, flags=re.IGNORECASE)
-        m_mr  = re.search(r'miss\s+rate\s*\|\s*([0-9.]+)\s*%',            body, flags=re.IGNORECASE)
-        out["l3_acc"] = m_acc.group(1) if m_acc else None
-        out["l3_miss"] = m_mis.group(1) if m_mis else None
-        out["l3_miss_rate_pct"] = m_mr.group(1) if m_mr else None
-    else:
-        out["l3_acc"] = None
-        out["l3_miss"] = None
-        out["l3_miss_rate_pct"] = None
-
-    dblk = re.search(r'DRAM summary(.*?)(?:\n\s*\n|$)', t, flags=re.IGNORECASE | re.S | re.M)
-    dram_acc = dram_lat_val = dram_lat_unit = None
-    if dblk:
-        dtxt = dblk.group(1)
-        dacc = re.search(r'num\s+dram\s+(accesses|requests)\s*\|\s*([0-9]+)', dtxt, flags=re.IGNORECASE)
-        dlat = re.search(r'average\s+dram\s+access\s+latency\s*\|\s*([0-9.]+)\s*([a-zA-Z]+)', dtxt, flags=re.IGNORECASE)
-        if dacc: dram_acc = dacc.group(2)
-        if dlat:
-            dram_lat_val  = dlat.group(1)
-            dram_lat_unit = dlat.group(2)
-
-    out["dram_acc"] = dram_acc
-    out["dram_lat_value"] = dram_lat_val
-    out["dram_lat_unit"]  = dram_lat_unit
-    return out, t
+    Top-level fields are read from the head of the file; L3 fields only from the
+    "Cache L3" block (up to "DRAM summary") and DRAM fields only from the "DRAM summary"
+    block (up to the next blank line), both bracketed with find() starting in the tail of
+    the (mmapped) file, so large sim.out files only have their head and tail paged in.
+    Returns: dict[str,str]
+    """
+    mm = _map_file(path)
+    out = dict.fromkeys(_SIMOUT_KEYS)
+    try:
+        todo = len(_TOP_FIELDS)
+        for key, value in _label_lines(mm):
+            field = _TOP_FIELDS.get(key)
+            if field is None or value is None or out[field] is not None:
+                continue
+            out[field] = _lead(value)
+            if out[field] is not None:
+                todo -= 1
+                if not todo:
+                    break
+
+        dram_start, dram_body = _find_header_tail(mm, b"DRAM summary")
+        l3_start, l3_body = _find_header_tail(mm, b"Cache L3")
+        if l3_start >= 0:
+            # Sniper prints DRAM summary after the caches, so the first header usually ends L3 too
+            l3_end = dram_start if dram_start >= l3_body else \
+                _find_header(mm, b"DRAM summary", l3_body)[0]
+            for key, value in _label_lines(mm, l3_body, l3_end if l3_end >= 0 else None):
+                field = _L3_FIELDS.get(key)
+                if field is not None and value is not None and out[field[0]] is None:
+                    out[field[0]] = _group(field[1].match(value))
+
+        if dram_body >= 0:
+            # The block ends at the first blank line; bracket it with find() and still stop
+            # early on whitespace-only lines inside the slice.
+            blank = mm.find(b"\n\n", dram_body - 1)
+            for key, value in _label_lines(mm, dram_body, blank + 1 if blank >= 0 else None):
+                if value is None:
+                    if not key:
+                        break
+                    continue
+                field = _DRAM_FIELDS.get(key)
+                if field is not None:
+                    if out[field[0]] is None:
+                        out[field[0]] = _group(field[1].match(value))
+                elif key.startswith(_DRAM_LAT_LABEL) and out["dram_lat_value"] is None:
+                    # "average dram access latency | 85.5 ns" or "... latency (ns) | 85.5"
+                    m = _RE_LAT.match(value)
+                    if m:
+                        out["dram_lat_value"] = _group(m, 1)
+                        out["dram_lat_unit"] = _group(m, 2) or key[len(_DRAM_LAT_LABEL):].strip(b"()").decode("ascii") or None
+    finally:
+        _unmap(mm)
+    return out
 
 def to_float_or_nan(s):
     try:
@@ -124,264 +304,241 @@ def to_float_or_nan(s):
         return float('nan')
 
 def to_int_or_zero(s):
+    if s is None or s == '':
+        return 0
+    if type(s) is int:
+        return s
+    if not isinstance(s, str):
+        s = str(s)
+    if ',' in s:            # sim.out thousands separators ("1,234,567")
+        s = s.replace(',', '')
     try:
-        return int(str(s).replace(',', '')) if s not in (None, '') else 0
-    except Exception:
+        return int(s)
+    except ValueError:
         return 0
 
 # =========================
 # SQLite helpers (exact LLC)
 # =========================
-def read_llc_exact_from_db(run_dir):
+_STATS_PRAGMAS = (
+    "PRAGMA query_only=1",
+    "PRAGMA busy_timeout=0",        # never wait on a writer (immutable opens take no locks anyway)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",   # 256 MiB: pages are mapped instead of pread() into the cache
+    "PRAGMA cache_size=-65536",     # 64 MiB page cache for whatever is not mapped
+)
+
+def _open_stats_db(run_dir):
     """
-    Return exact L3 stats from sim.stats.sqlite3 over the ROI (end - begin):
-      A_db (loads+stores on L3), M_db (load-misses+store-misses on L3),
-      RH, WH = l3_*_hits summed across ALL L3 slices (objectname LIKE 'L3%'),
-      WB, EV, M_custom on L3,
-      plus debug fields: RH_local/RH_remote/WH_local/WH_remote and prefetch counters and coh_upgrades.
+    Read-only connection to <run_dir>/sim.stats.sqlite3 (None if absent), opened as an
+    immutable URI so SQLite skips locking and journal checks. The simulator's DB is
+    never written; SQLite's automatic indexes cover the ROI-delta joins. The caller closes it.
     """
     db = os.path.join(run_dir, "sim.stats.sqlite3")
     if not os.path.exists(db):
         return None
-
-    with sqlite3.connect(db) as conn:
-        cur = conn.cursor()
-
-        # ROI-delta helpers
-        def sum_delta_int_L3(metrics):
-            placeholders = ",".join(["?"] * len(metrics))
-            sql = """
-                SELECT COALESCE(SUM(
-                    CASE p.prefixname
-                        WHEN 'roi-end'   THEN v.value
-                        WHEN 'roi-begin' THEN -v.value
-                        ELSE 0
-                    END
-                ), 0)
-                FROM "values" v
-                JOIN names    n ON v.nameid   = n.nameid
-                JOIN prefixes p ON v.prefixid = p.prefixid
-                WHERE n.objectname='L3'
-                  AND n.metricname IN ({})
-                  AND p.prefixname IN ('roi-begin','roi-end');
-            """.format(placeholders)
-            cur.execute(sql, tuple(metrics))
-            val = cur.fetchone()[0]
-            try:
-                return int(val or 0)
-            except Exception:
-                return int(float(val or 0.0))
-
-        def one_delta_int_L3(metric):
-            return sum_delta_int_L3((metric,))
-
-        def sum_delta_int_like(metric, obj_like):
-            cur.execute("""
-                SELECT COALESCE(SUM(
-                    CASE p.prefixname
-                        WHEN 'roi-end'   THEN v.value
-                        WHEN 'roi-begin' THEN -v.value
-                        ELSE 0
-                    END
-                ), 0)
-                FROM "values" v
-                JOIN names    n ON v.nameid   = n.nameid
-                JOIN prefixes p ON v.prefixid = p.prefixid
-                WHERE n.metricname = ?
-                  AND n.objectname LIKE ?
-                  AND p.prefixname IN ('roi-begin','roi-end');
-            """, (metric, obj_like))
-            val = cur.fetchone()[0]
-            try:
-                return int(val or 0)
-            except Exception:
-                return int(float(val or 0.0))
-
-        # Accesses/misses from L3 only (same as before)
-        A_db     = sum_delta_int_L3(("loads", "stores"))
-        M_db     = sum_delta_int_L3(("load-misses", "store-misses"))
-
-        # Hits from ALL L3 slices (L3, L3.next_read, etc.)
-        RH_local = one_delta_int_L3("l3_read_hits")
-        RH_all   = sum_delta_int_like("l3_read_hits",  "L3%")
-        RH_remote = max(RH_all - RH_local, 0)
-
-        WH_local = one_delta_int_L3("l3_write_hits")
-        WH_all   = sum_delta_int_like("l3_write_hits", "L3%")
-        WH_remote = max(WH_all - WH_local, 0)
-
-        RH = RH_all
-        WH = WH_all
-
-        # Other L3-only counters
-        WB          = one_delta_int_L3("l3_writebacks")
-        EV          = one_delta_int_L3("l3_evictions")
-        M_custom    = one_delta_int_L3("l3_misses")
-        coh_upgrades= one_delta_int_L3("coherency-upgrades")
-
-        # Optional debug (may be zero on many benches)
-        hits_prefetch   = one_delta_int_L3("hits-prefetch")
-        loads_prefetch  = one_delta_int_L3("loads-prefetch")
-        stores_prefetch = one_delta_int_L3("stores-prefetch")
-        prefetches      = one_delta_int_L3("prefetches")
-
-    return dict(
-        A_db=A_db, M_db=M_db, RH=RH, WH=WH, WB=WB, EV=EV, M_custom=M_custom,
-        RH_local=RH_local, RH_remote=RH_remote, WH_local=WH_local, WH_remote=WH_remote,
-        hits_prefetch=hits_prefetch, loads_prefetch=loads_prefetch,
-        stores_prefetch=stores_prefetch, prefetches=prefetches,
-        coh_upgrades=coh_upgrades
+    import sqlite3
+    import urllib.parse
+    uri = "file:" + urllib.parse.quote(os.path.abspath(db)) + "?mode=ro&immutable=1"
+    try:
+        conn = sqlite3.connect(uri, uri=True)
+    except sqlite3.Error:   # builds/filesystems that refuse the URI form: plain open
+        conn = sqlite3.connect(db)
+    for pragma in _STATS_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _as_int(val):
+    try:
+        return int(val or 0)
+    except Exception:
+        return int(float(val or 0.0))
+
+LLC_EXACT_METRICS = (
+    "loads", "stores", "load-misses", "store-misses",
+    "l3_read_hits", "l3_write_hits", "l3_writebacks", "l3_evictions", "l3_misses",
+    "coherency-upgrades", "hits-prefetch", "loads-prefetch", "stores-prefetch", "prefetches",
+)
+LLC_LATENCY_METRICS = {
+    "total-latency":     "l3_total_latency_ns",
+    "mshr-latency":      "l3_mshr_latency_ns",
+    "snoop-latency":     "l3_snoop_latency_ns",
+    "qbs-query-latency": "l3_qbs_latency_ns",
+}
+
+_LLC_STATS_ARGS = (*LLC_EXACT_METRICS, *LLC_LATENCY_METRICS, "uncore-requests")
+# The small names/prefixes tables are resolved to integer ids first, so the scan of the
+# large "values" table is a plain integer filter with no per-row joins.
+_LLC_NAMES_SQL = """
+    SELECT nameid, objectname, metricname FROM names
+    WHERE objectname LIKE 'L3%'
+      AND (metricname IN ({}) OR metricname LIKE 'uncore-time-%');
+""".format(",".join(["?"] * len(_LLC_STATS_ARGS)))
+_ROI_PREFIXES_SQL = "SELECT prefixid, prefixname FROM prefixes WHERE prefixname IN ('roi-begin','roi-end');"
+
+@functools.lru_cache(maxsize=16)
+def _roi_values_sql(n_prefixes, n_names):
+    """
+    Grouped ROI scan of "values" for n_prefixes / n_names bound ids. The text only depends
+    on the two counts (identical across runs of one build), so every run reuses the same
+    string and sqlite3's per-connection statement cache keys on it.
+    """
+    return """
+    SELECT nameid, prefixid, SUM(value), TOTAL(value) FROM "values"
+    WHERE prefixid IN ({}) AND nameid IN ({})
+    GROUP BY nameid, prefixid;
+""".format(",".join(["?"] * n_prefixes), ",".join(["?"] * n_names))
+
+@functools.lru_cache(maxsize=None)
+@_sidecar_cached(".llc_stats.json", _run_files("sim.stats.sqlite3"))
+def read_llc_all(run_dir):
+    """
+    Every L3 ROI delta (end - begin) the report needs, from one grouped scan of "values"
+    (by pre-resolved name/prefix ids) on one short-lived connection to sim.stats.sqlite3;
+    the memoized result is what every other DB consumer reads. Returns dict with
+      exact:    A_db (loads+stores on L3), M_db (load-misses+store-misses on L3),
+                RH, WH = l3_*_hits summed across ALL L3 slices (objectname LIKE 'L3%'),
+                WB, EV, M_custom on L3,
+                plus debug fields: RH_local/RH_remote/WH_local/WH_remote and prefetch
+                counters and coh_upgrades (None without a DB)
+      latency:  l3_total_latency_ns, l3_mshr_latency_ns, l3_snoop_latency_ns, l3_qbs_latency_ns,
+                l3_uncore_time_sum_ns = sum of uncore-time-* (safe) on L3 ({} without a DB)
+      uncore_requests: uncore-requests on L3 (0 without a DB)
+    """
+    conn = _open_stats_db(run_dir)
+    if conn is None:
+        return dict(exact=None, latency={}, uncore_requests=0)
+
+    L3 = dict.fromkeys(_LLC_STATS_ARGS, 0)        # objectname = 'L3' only
+    RH_all = WH_all = 0                           # all L3 slices (L3, L3.next_read, etc.)
+    lat = dict.fromkeys(LLC_LATENCY_METRICS.values(), 0.0)
+    lat["l3_uncore_time_sum_ns"] = 0.0
+    deltas = {}                                   # (objectname, metricname) -> [SUM, TOTAL] of end - begin
+    try:
+        names = {nid: (obj, metric) for nid, obj, metric in conn.execute(_LLC_NAMES_SQL, _LLC_STATS_ARGS)}
+        sign = {pid: (1 if pname == "roi-end" else -1) for pid, pname in conn.execute(_ROI_PREFIXES_SQL)}
+        if names and sign:
+            sql = _roi_values_sql(len(sign), len(names))
+            for nid, pid, val, total in conn.execute(sql, (*sign, *names)):
+                d = deltas.setdefault(names[nid], [0, 0.0])
+                d[0] += sign[pid] * (val or 0)
+                d[1] += sign[pid] * total
+    finally:
+        conn.close()
+
+    for (obj, metric), (val, total) in deltas.items():
+        if metric == "l3_read_hits":
+            RH_all += _as_int(val)
+        elif metric == "l3_write_hits":
+            WH_all += _as_int(val)
+        if obj != "L3":
+            continue
+        if metric in LLC_LATENCY_METRICS:
+            lat[LLC_LATENCY_METRICS[metric]] += total
+        elif metric in L3:
+            L3[metric] += _as_int(val)
+        else:                                     # uncore-time-*
+            lat["l3_uncore_time_sum_ns"] += total
+
+    RH_local = L3["l3_read_hits"]
+    WH_local = L3["l3_write_hits"]
+
+    exact = dict(
+        A_db=L3["loads"] + L3["stores"],
+        M_db=L3["load-misses"] + L3["store-misses"],
+        RH=RH_all, WH=WH_all,
+        WB=L3["l3_writebacks"], EV=L3["l3_evictions"], M_custom=L3["l3_misses"],
+        RH_local=RH_local, RH_remote=max(RH_all - RH_local, 0),
+        WH_local=WH_local, WH_remote=max(WH_all - WH_local, 0),
+        hits_prefetch=L3["hits-prefetch"], loads_prefetch=L3["loads-prefetch"],
+        stores_prefetch=L3["stores-prefetch"], prefetches=L3["prefetches"],
+        coh_upgrades=L3["coherency-upgrades"]
     )
+    return dict(exact=exact, latency=lat, uncore_requests=L3["uncore-requests"])
 
-def read_llc_latency_from_db(run_dir):
+def _read_sim_cfg(run_dir):
+    """<run_dir>/sim.cfg as bytes (b"" if missing)."""
+    try:
+        fd = os.open(os.path.join(run_dir, "sim.cfg"), os.O_RDONLY)
+    except OSError:
+        return b""
+    try:    # one unbuffered read of the whole (small) file
+        return os.read(fd, os.fstat(fd).st_size)
+    except OSError:
+        return b""
+    finally:
+        os.close(fd)
+
+_LLC_ENERGY_FIELDS = {   # sim.cfg key -> consts key, in SRAM_DEFAULT/JANS_DEFAULT order
+    b"e_read_hit_pJ":  "E_hit_nJ",
+    b"e_miss_pJ":      "E_miss_nJ",
+    b"e_write_hit_pJ": "E_write_nJ",
+    b"p_leak_mW":      "P_leak_W",
+}
+_RE_LLC_ENERGY = re.compile(
+    rb'perf_model/l3_cache/llc/(e_read_hit_pJ|e_write_hit_pJ|e_miss_pJ|p_leak_mW)\s*=\s*([0-9.]+)')
+
+# One multiline scan of sim.cfg for everything read from it:
+#   1 = section header, else a *_hit_latency_cycles key (line-anchored, any case):
+#     2 = fully-qualified perf_model/... prefix, 3 = ".next_read", 4 = read|write, 5 = cycles
+#   6, 7 = an LLC energy override key and value (_RE_LLC_ENERGY, anywhere in a line)
+_RE_SIM_CFG = re.compile(
+    rb'^[ \t]*(?i:\[(.+?)\]|(perf_model/l3_cache/llc(\.next_read)?/)?(read|write)_hit_latency_cycles[ \t]*=[ \t]*([0-9]+))'
+    rb'|' + _RE_LLC_ENERGY.pattern,
+    re.M)
+_LLC_CFG_SECTS = {"perf_model/l3_cache/llc": False, "perf_model/l3_cache/llc.next_read": True}
+
+@functools.lru_cache(maxsize=8)
+def _scan_sim_cfg(run_dir):
     """
-    Return L3 latency/time buckets (ns) over ROI (end - begin):
-      l3_total_latency_ns, l3_mshr_latency_ns, l3_snoop_latency_ns, l3_qbs_latency_ns
-      l3_uncore_time_sum_ns = sum of uncore-time-* (safe)
+    Hit-latency cycles and LLC energy overrides from a single pass over sim.cfg.
+    Returns: ({(is_next_read, "read"|"write"): cycles}, energy consts dict or None)
     """
-    db = os.path.join(run_dir, "sim.stats.sqlite3")
-    if not os.path.exists(db):
-        return {}
-    with sqlite3.connect(db) as conn:
-        cur = conn.cursor()
-
-        def one_delta_real(metricname):
-            cur.execute("""
-                SELECT COALESCE(SUM(
-                    CASE p.prefixname
-                        WHEN 'roi-end'   THEN v.value*1.0
-                        WHEN 'roi-begin' THEN -v.value*1.0
-                        ELSE 0
-                    END
-                ), 0.0)
-                FROM "values" v
-                JOIN names    n ON v.nameid   = n.nameid
-                JOIN prefixes p ON v.prefixid = p.prefixid
-                WHERE n.objectname='L3'
-                  AND n.metricname = ?
-                  AND p.prefixname IN ('roi-begin','roi-end');
-            """, (metricname,))
-            row = cur.fetchone()
-            return float(row[0] or 0.0)
-
-        lat = {
-            "l3_total_latency_ns":  one_delta_real("total-latency"),
-            "l3_mshr_latency_ns":   one_delta_real("mshr-latency"),
-            "l3_snoop_latency_ns":  one_delta_real("snoop-latency"),
-            "l3_qbs_latency_ns":    one_delta_real("qbs-query-latency"),
-        }
-
-        # Sum all uncore-time-* over ROI
-        cur.execute("""
-            SELECT COALESCE(SUM(
-                CASE p.prefixname
-                    WHEN 'roi-end'   THEN v.value*1.0
-                    WHEN 'roi-begin' THEN -v.value*1.0
-                    ELSE 0
-                END
-            ), 0.0)
-            FROM "values" v
-            JOIN names    n ON v.nameid   = n.nameid
-            JOIN prefixes p ON v.prefixid = p.prefixid
-            WHERE n.objectname='L3'
-              AND n.metricname LIKE 'uncore-time-%'
-              AND p.prefixname IN ('roi-begin','roi-end');
-        """)
-        lat["l3_uncore_time_sum_ns"] = float(cur.fetchone()[0] or 0.0)
-
-    return lat
-
-def read_uncore_requests(run_dir):
-    db = os.path.join(run_dir, "sim.stats.sqlite3")
-    if not os.path.exists(db):
-        return 0
-    with sqlite3.connect(db) as conn:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT COALESCE(SUM(
-                CASE p.prefixname
-                    WHEN 'roi-end'   THEN v.value
-                    WHEN 'roi-begin' THEN -v.value
-                    ELSE 0
-                END
-            ), 0)
-            FROM "values" v
-            JOIN names    n ON v.nameid   = n.nameid
-            JOIN prefixes p ON v.prefixid = p.prefixid
-            WHERE n.objectname='L3'
-              AND n.metricname='uncore-requests'
-              AND p.prefixname IN ('roi-begin','roi-end');
-        """)
-        row = cur.fetchone()
-        return int(row[0] or 0)
+    cyc = {}
+    energy = {}
+    sect = None
+    for m in _RE_SIM_CFG.finditer(_read_sim_cfg(run_dir)):
+        if m.group(6) is not None:
+            energy.setdefault(m.group(6), m.group(7))   # first occurrence wins
+            continue
+        if m.group(1) is not None:
+            sect = m.group(1).strip().lower().decode("ascii", "ignore")
+            continue
+        if m.group(2):                  # fully-qualified perf_model/... key
+            is_next = m.group(3) is not None
+        elif sect in _LLC_CFG_SECTS:
+            is_next = _LLC_CFG_SECTS[sect]
+        else:
+            continue
+        cyc[(is_next, m.group(4).lower().decode("ascii"))] = int(m.group(5))
+
+    consts = None
+    if len(energy) == len(_LLC_ENERGY_FIELDS):
+        try:    # pJ -> nJ, mW -> W
+            consts = {k: float(energy[key]) / 1000.0 for key, k in _LLC_ENERGY_FIELDS.items()}
+        except ValueError:
+            pass
+    return cyc, consts
 
+@functools.lru_cache(maxsize=None)
+@_sidecar_cached(".llc_hit_cycles.json", _run_files("sim.cfg", "sim.stats.sqlite3"))
 def parse_llc_hit_cycles(run_dir):
     """
     Return effective LLC read/write hit cycles.
 
     Reads:
-      sim.cfg:
+      sim.cfg (via _scan_sim_cfg):
         [perf_model/l3_cache/llc] and optional [perf_model/l3_cache/llc.next_read]
         or fully-qualified perf_model/... keys.
-      sim.stats.sqlite3 (optional) to weight local vs remote hits over ROI.
+      sim.stats.sqlite3 (optional) to weight local vs remote hits over ROI; the
+        RH/WH_local/remote split comes from read_llc_all's single grouped query.
 
     Returns: (rd_cycles:int|None, wr_cycles:int|None)
     """
-    cfg = os.path.join(run_dir, "sim.cfg")
-    rd_llc = wr_llc = None
-    rd_next = wr_next = None
-    sect = None
+    cyc = _scan_sim_cfg(run_dir)[0]     # a missing sim.cfg just leaves cyc empty
 
-    # Parse sim.cfg
-    if os.path.exists(cfg):
-        try:
-            with open(cfg, "r", encoding="utf-8", errors="ignore") as f:
-                for raw in f:
-                    line = raw.strip()
-                    if not line or line.startswith(("#",";")):
-                        continue
-                    m = re.match(r'\[(.+?)\]', line)
-                    if m:
-                        sect = m.group(1).strip().lower()
-                        continue
-
-                    m = re.match(r'perf_model/l3_cache/llc(?:\.next_read)?/read_hit_latency_cycles\s*=\s*([0-9]+)', line, flags=re.I)
-                    if m:
-                        val = int(m.group(1))
-                        if ".next_read/" in line.lower():
-                            rd_next = val
-                        else:
-                            rd_llc = val
-                        continue
-
-                    m = re.match(r'perf_model/l3_cache/llc(?:\.next_read)?/write_hit_latency_cycles\s*=\s*([0-9]+)', line, flags=re.I)
-                    if m:
-                        val = int(m.group(1))
-                        if ".next_read/" in line.lower():
-                            wr_next = val
-                        else:
-                            wr_llc = val
-                        continue
-
-                    if sect in ("perf_model/l3_cache/llc", "perf_model/l3_cache/llc.next_read"):
-                        m = re.match(r'read_hit_latency_cycles\s*=\s*([0-9]+)', line, flags=re.I)
-                        if m:
-                            val = int(m.group(1))
-                            if sect.endswith(".next_read"):
-                                rd_next = val
-                            else:
-                                rd_llc = val
-                            continue
-                        m = re.match(r'write_hit_latency_cycles\s*=\s*([0-9]+)', line, flags=re.I)
-                        if m:
-                            val = int(m.group(1))
-                            if sect.endswith(".next_read"):
-                                wr_next = val
-                            else:
-                                wr_llc = val
-                            continue
-        except Exception:
-            pass
+    rd_llc,  wr_llc  = cyc.get((False, "read")), cyc.get((False, "write"))
+    rd_next, wr_next = cyc.get((True, "read")),  cyc.get((True, "write"))
 
     have_llc  = (rd_llc is not None and wr_llc is not None)
     have_next = (rd_next is not None and wr_next is not None)
@@ -394,57 +551,14 @@ def parse_llc_hit_cycles(run_dir):
         return rd_next, wr_next
 
     # Weight by ROI-delta local vs remote hits (if DB is present)
-    db = os.path.join(run_dir, "sim.stats.sqlite3")
-    if not os.path.exists(db):
-        return rd_llc, wr_llc
-
-    def _roi_delta(cur, metric, obj_exact=None, obj_like=None):
-        if obj_exact is not None:
-            cur.execute("""
-                SELECT COALESCE(SUM(
-                    CASE p.prefixname
-                        WHEN 'roi-end'   THEN v.value
-                        WHEN 'roi-begin' THEN -v.value
-                        ELSE 0
-                    END
-                ), 0)
-                FROM "values" v
-                JOIN names    n ON v.nameid   = n.nameid
-                JOIN prefixes p ON v.prefixid = p.prefixid
-                WHERE n.metricname=? AND n.objectname=? AND p.prefixname IN ('roi-begin','roi-end');
-            """, (metric, obj_exact))
-        else:
-            cur.execute("""
-                SELECT COALESCE(SUM(
-                    CASE p.prefixname
-                        WHEN 'roi-end'   THEN v.value
-                        WHEN 'roi-begin' THEN -v.value
-                        ELSE 0
-                    END
-                ), 0)
-                FROM "values" v
-                JOIN names    n ON v.nameid   = n.nameid
-                JOIN prefixes p ON v.prefixid = p.prefixid
-                WHERE n.metricname=? AND n.objectname LIKE ? AND p.prefixname IN ('roi-begin','roi-end');
-            """, (metric, obj_like))
-        row = cur.fetchone()
-        try:
-            return int(row[0] or 0)
-        except Exception:
-            return int(float(row[0] or 0.0))
-
     try:
-        with sqlite3.connect(db) as conn:
-            cur = conn.cursor()
-            RH_local = _roi_delta(cur, "l3_read_hits",  obj_exact="L3")
-            RH_all   = _roi_delta(cur, "l3_read_hits",  obj_like="L3%")
-            WH_local = _roi_delta(cur, "l3_write_hits", obj_exact="L3")
-            WH_all   = _roi_delta(cur, "l3_write_hits", obj_like="L3%")
+        db = read_llc_all(run_dir)["exact"]
     except Exception:
         return rd_llc, wr_llc
-
-    RH_remote = max(RH_all - RH_local, 0)
-    WH_remote = max(WH_all - WH_local, 0)
+    if db is None:
+        return rd_llc, wr_llc
+    RH_local, RH_remote = db["RH_local"], db["RH_remote"]
+    WH_local, WH_remote = db["WH_local"], db["WH_remote"]
 
     rd_total = RH_local + RH_remote
     wr_total = WH_local + WH_remote
@@ -459,25 +573,40 @@ def avg_l3_hit_ns(rd_cyc, wr_cyc, RH, WH, period_ns):
     Weighted avg hit time in ns:
       (RH*rd_cyc + WH*wr_cyc) * period_ns / (RH+WH)
     """
-    try:
-        total = (RH or 0) + (WH or 0)
-        if not rd_cyc or not wr_cyc or total <= 0 or not period_ns or period_ns <= 0:
-            return None
-        return ((RH*rd_cyc + WH*wr_cyc) * period_ns) / total
-    except Exception:
+    RH, WH = RH or 0, WH or 0
+    total = RH + WH
+    if not rd_cyc or not wr_cyc or total <= 0 or not period_ns or period_ns <= 0:
         return None
+    return ((RH*rd_cyc + WH*wr_cyc) * period_ns) / total
 
 def period_ns_from_parsed(parsed):
-    try:
-        cyc = int(parsed.get("cycles") or 0)
-        tns = int(parsed.get("time_ns") or 0)
-        return (tns / cyc) if (cyc > 0) else None
-    except Exception:
+    cyc = parsed.get("cycles") or "0"
+    tns = parsed.get("time_ns") or "0"
+    if not (cyc.isdigit() and tns.isdigit()):   # e.g. a fractional value int() would reject
         return None
+    cyc = int(cyc)
+    return (int(tns) / cyc) if (cyc > 0) else None
 
 # =========================
 # Energy parsing & math
 # =========================
+_LLC_ENERGY_FILES = ("sim.cfg", "sim.info", "sim.inf")
+_LLC_ENERGY_KEY = b"e_read_hit_pJ"   # cheap pre-filter: runs without overrides lack all four
+
+def _scan_llc_energy(buf):
+    """All four LLC energy overrides from one pass over buf (first occurrence wins), else None."""
+    if buf.find(_LLC_ENERGY_KEY) < 0:
+        return None
+    found = {}
+    for m in _RE_LLC_ENERGY.finditer(buf):
+        found.setdefault(m.group(1), m.group(2))
+        if len(found) == len(_LLC_ENERGY_FIELDS):
+            # pJ -> nJ, mW -> W
+            return {k: float(found[key]) / 1000.0 for key, k in _LLC_ENERGY_FIELDS.items()}
+    return None
+
+@functools.lru_cache(maxsize=None)
+@_sidecar_cached(".llc_energy_consts.json", _run_files(*_LLC_ENERGY_FILES))
 def parse_llc_energy_consts(run_dir):
     """
     Try to read LLC energy constants from (in order):
@@ -487,92 +616,122 @@ def parse_llc_energy_consts(run_dir):
 
     Returns dict in nJ/W on success, else None.
     """
-    def _scan_text(txt):
-        patt = {
-            "E_hit_nJ":  r'perf_model/l3_cache/llc/e_read_hit_pJ\s*=\s*([0-9.]+)',
-            "E_write_nJ":r'perf_model/l3_cache/llc/e_write_hit_pJ\s*=\s*([0-9.]+)',
-            "E_miss_nJ": r'perf_model/l3_cache/llc/e_miss_pJ\s*=\s*([0-9.]+)',
-            "P_leak_W":  r'perf_model/l3_cache/llc/p_leak_mW\s*=\s*([0-9.]+)',
-        }
-        out = {}
-        for k, rgx in patt.items():
-            m = re.search(rgx, txt)
-            if not m:
-                return None
-            val = float(m.group(1))
-            if k == "P_leak_W":
-                out[k] = val / 1000.0  # mW -> W
-            else:
-                out[k] = val / 1000.0  # pJ -> nJ
-        return out
-
-    cfg = os.path.join(run_dir, "sim.cfg")
-    if os.path.exists(cfg):
-        try:
-            with open(cfg, "r", encoding="utf-8", errors="ignore") as f:
-                vals = _scan_text(f.read())
-                if vals: return vals
-        except Exception:
-            pass
-
-    info = os.path.join(run_dir, "sim.info")
-    if os.path.exists(info):
+    for name in _LLC_ENERGY_FILES:
+        if name == "sim.cfg":                   # scanned together with the hit latencies
+            vals = _scan_sim_cfg(run_dir)[1]
+            if vals:
+                return vals
+            continue
+        buf = _map_file(os.path.join(run_dir, name), quiet=True)   # b"" if missing
         try:
-            with open(info, "r", encoding="utf-8", errors="ignore") as f:
-                vals = _scan_text(f.read())
-                if vals: return vals
+            vals = _scan_llc_energy(buf)
         except Exception:
-            pass
-
-    info_alt = os.path.join(run_dir, "sim.inf")
-    if os.path.exists(info_alt):
-        try:
-            with open(info_alt, "r", encoding="utf-8", errors="ignore") as f:
-                vals = _scan_text(f.read())
-                if vals: return vals
-        except Exception:
-            pass
-
+            vals = None
+        finally:
+            _unmap(buf)
+        if vals:
+            return vals
     return None
 
 def energy_bounds(E_hit_nJ, E_miss_nJ, E_write_nJ, P_leak_W, T_s, acc, mis):
     hits = max(acc - mis, 0)
     dyn_lo_nJ = E_hit_nJ * hits + E_miss_nJ * mis   # assume all hits are reads
     dyn_hi_nJ = E_write_nJ * hits + E_miss_nJ * mis # assume all hits are writes
-    eleak_J   = P_leak_W * (T_s if T_s == T_s else 0.0)
+    eleak_J   = P_leak_W * (0.0 if math.isnan(T_s) else T_s)
     return (dyn_lo_nJ*1e-9 + eleak_J, dyn_hi_nJ*1e-9 + eleak_J), (dyn_lo_nJ, dyn_hi_nJ), eleak_J
 
 def energy_exact_from_counts(E_hit_nJ, E_miss_nJ, E_write_nJ, P_leak_W, T_s, RH, WH, M):
     dyn_nJ = E_hit_nJ*RH + E_write_nJ*WH + E_miss_nJ*M
-    E = dyn_nJ*1e-9 + P_leak_W*(T_s if T_s == T_s else 0.0)
+    E = dyn_nJ*1e-9 + P_leak_W*(0.0 if math.isnan(T_s) else T_s)
     return dyn_nJ, E
 
 def ed2p(E_J, T_s):
-    if not (E_J == E_J) or not (T_s == T_s):
+    if math.isnan(E_J) or math.isnan(T_s):
         return float('nan')
-    return E_J * (T_s ** 2)
+    return E_J * (T_s * T_s)
+
+def energy_row(prefix, cfg, consts, T, A_txt, M_txt, db, RH_use, WH_use, gap, note):
+    """
+    One energy_bounds.csv row; prefix is the (bench_name, n_m) cell pair shared with the
+    summary rows. Bounds, exact energy and ED^2P are computed as locals and formatted in
+    the same pass (same arithmetic as energy_bounds / energy_exact_from_counts / ed2p).
+    Returns: (row, E_lo_J, E_hi_J, leak_J, E_exact_J) for the console report.
+    """
+    E_hit, E_miss, E_write, P_leak = (consts["E_hit_nJ"], consts["E_miss_nJ"],
+                                      consts["E_write_nJ"], consts["P_leak_W"])
+    T_nan = math.isnan(T)
+    T2 = T * T
+    leakJ = P_leak * (0.0 if T_nan else T)
+
+    hits = max(A_txt - M_txt, 0)
+    dyn_lo = E_hit * hits + E_miss * M_txt     # assume all hits are reads
+    dyn_hi = E_write * hits + E_miss * M_txt   # assume all hits are writes
+    E_lo = dyn_lo * 1e-9 + leakJ
+    E_hi = dyn_hi * 1e-9 + leakJ
+
+    if db:
+        dyn_ex = E_hit * RH_use + E_write * WH_use + E_miss * db["M_db"]
+        E_ex = dyn_ex * 1e-9 + leakJ
+        exact = (f"{dyn_ex:.0f}", f"{E_ex:.6f}", f"{E_ex * T2:.9e}")   # NaN T formats as "nan"
+        counts = (str(db["A_db"]), str(db["M_db"]), str(db["RH"]), str(db["WH"]), str(db["WB"]), str(db["EV"]))
+        exact_src = "sqlite" + ("+rebalanced" if gap > 0 else "")
+    else:
+        E_ex = float('nan')
+        exact = ("", "", "")
+        counts = (str(A_txt), str(M_txt), "", "", "", "")
+        exact_src = ""
+
+    row = [
+        *prefix, cfg,
+        f"{T:.6f}",
+        *counts,
+        f"{P_leak:.3f}", f"{leakJ:.6f}",
+        *exact,
+        f"{dyn_lo:.0f}", f"{dyn_hi:.0f}",
+        f"{E_lo:.6f}", f"{E_hi:.6f}",
+        f"{E_lo * T2:.9e}", f"{E_hi * T2:.9e}",
+        "llc_only", exact_src, note
+    ]
+    return row, E_lo, E_hi, leakJ, E_ex
 
 # =========================
 # Reconcile missing hits (coherency upgrades etc.) for energy
 # =========================
+def mismatch_note(d):
+    """Consistency note for energy_bounds.csv: "ok" when L3 A-M matches RH+WH within ±2."""
+    if d is None:
+        return "sqlite_missing"
+    other = (d["A_db"] - d["M_db"]) - (d["RH"] + d["WH"])
+    if -2 <= other <= 2:  # tolerate ±2 boundary jitter
+        return "ok"
+    up = d["coh_upgrades"]
+    hp = d["hits_prefetch"]
+    if not (up or hp):
+        return f"warn_A-M!=RH+WH(diff={other})"
+    extras = []
+    if up: extras.append(f"upgrades={up}")
+    if hp: extras.append(f"hits_prefetch={hp}")
+    return f"warn_A-M!=RH+WH(diff={other}; {', '.join(extras)})"
+
 def reconcile_hits_for_energy(db):
     """
     Ensure RH+WH == (A_db - M_db) by allocating the missing hits (gap)
     primarily to writes (coherency upgrades), then split any remainder
     proportionally by the observed RH:WH ratio (or 50/50 if none).
+    db is read_llc_all()["exact"]: every count is an int (0 when the metric is absent).
     Returns: RH_use, WH_use, gap
     """
     if not db:
         return 0, 0, 0
     H_tot = max((db["A_db"] - db["M_db"]), 0)
-    RHc, WHc = db["RH"] or 0, db["WH"] or 0
+    RHc, WHc = db["RH"], db["WH"]
     counted = RHc + WHc
     gap = H_tot - counted
     if gap <= 0:
         return RHc, WHc, 0
 
     # allocate as write-like hits up to coh_upgrades
-    add_w = min(gap, db.get("coh_upgrades") or 0)
+    add_w = min(gap, db["coh_upgrades"])
     RH_use, WH_use = RHc, WHc + add_w
     rem = gap - add_w
     if rem > 0:
@@ -585,234 +744,255 @@ def reconcile_hits_for_energy(db):
 # =========================
 # CSV writer (overwrite)
 # =========================
+_RE_CSV_SPECIAL = re.compile(r'[",\r\n]')
+
+def _csv_field(v):
+    """Quote like csv.writer's QUOTE_MINIMAL (only notes / run dirs ever need it)."""
+    if _RE_CSV_SPECIAL.search(v):
+        return '"' + v.replace('"', '""') + '"'
+    return v
+
 def write_csv_overwrite(path, header, rows):
-    ensure_dir(os.path.dirname(path))
-    with open(path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(header)
-        w.writerows(rows)
+    """Write header + rows (lists of str) as one bytes write; same bytes as csv.writer (CRLF)."""
+    data = "".join([",".join([_csv_field(v) for v in row]) + "\r\n" for row in (header, *rows)]).encode("utf-8")
+    try:
+        f = open(path, "wb")
+    except FileNotFoundError:   # create the output dir only when it is actually missing
+        ensure_dir(os.path.dirname(path))
+        f = open(path, "wb")
+    with f:
+        f.write(data)
+
+ENERGY_HEADER = [
+    "benchmark","n_m","config",
+    "time_s",
+    "l3_accesses","l3_misses_db","l3_read_hits","l3_write_hits",
+    "l3_writebacks","l3_evictions",
+    "leak_W","leak_J",
+    "dyn_exact_nJ","energy_exact_J","ed2p_exact_J_s2",
+    "dyn_lower_nJ","dyn_upper_nJ",
+    "energy_lower_J","energy_upper_J",
+    "ed2p_lower_J_s2","ed2p_upper_J_s2",
+    "energy_scope","exact_source","notes"
+]
+SUMMARY_HEADER = [
+    "timestamp_utc","benchmark","n_m","config",
+    "instructions","cycles","ipc","time_ns",
+    "l3_acc_text","l3_miss_text","l3_miss_rate_pct",
+    "dram_acc","dram_lat_value","dram_lat_unit",
+    "outdir",
+    "l3_accesses_db","l3_misses_db","l3_read_hits","l3_write_hits","l3_writebacks","l3_evictions","l3_misses_custom",
+    "l3_total_latency_ns","l3_mshr_latency_ns","l3_snoop_latency_ns","l3_qbs_latency_ns","l3_uncore_time_sum_ns",
+    "l3_uncore_requests","avg_uncore_time_per_req_ns",
+    "rd_hit_cycles","wr_hit_cycles","core_period_ns","avg_l3_hit_ns"
+]
 
 # =========================
-# Main
+# Per-pair processing
 # =========================
-def main():
-    ap = argparse.ArgumentParser(description="Write energy_bounds.csv and summary.csv to <OUT_ROOT>/output_<bench>/")
-    ap.add_argument("sram_simout", help="Path to SRAM sim.out")
-    ap.add_argument("jans_simout", help="Path to JanS sim.out")
-    args = ap.parse_args()
-
-    sram_simout = os.path.abspath(args.sram_simout)
-    jans_simout = os.path.abspath(args.jans_simout)
-
-    # hard fail on bad paths
-    for p in (sram_simout, jans_simout):
-        if not os.path.isfile(p):
-            raise SystemExit(f"[ERR] sim.out not found: {p}")
-
-    sram_dir = os.path.dirname(sram_simout)
-    jans_dir = os.path.dirname(jans_simout)
-
-    out_dir = infer_bench_root_from_run_dir(sram_dir)
-    ensure_dir(out_dir)
+def load_run(simout):
+    """Everything read from one run dir: parsed sim.out, sqlite stats, hit cycles, sim.cfg consts."""
+    run_dir = os.path.dirname(simout)
+    return dict(
+        parsed=parse_simout_full(simout),
+        stats=read_llc_all(run_dir),
+        hit_cycles=parse_llc_hit_cycles(run_dir),
+        cfg_consts=parse_llc_energy_consts(run_dir),
+    )
 
-    bench_name, n_m = extract_bench_name_and_nm(sram_dir)
+# summary.csv columns taken verbatim from read_llc_all's exact / latency dicts
+SUMMARY_DB_KEYS = ("A_db", "M_db", "RH", "WH", "WB", "EV", "M_custom")
+SUMMARY_LAT_KEYS = ("l3_total_latency_ns", "l3_mshr_latency_ns", "l3_snoop_latency_ns",
+                    "l3_qbs_latency_ns", "l3_uncore_time_sum_ns")
 
-    sram_parsed, _ = parse_simout_full(sram_simout)
-    jans_parsed, _ = parse_simout_full(jans_simout)
+_RUN_INPUTS = ("sim.stats.sqlite3", *_LLC_ENERGY_FILES)   # sim.cfg is among the energy files
 
-    T_s = to_float_or_nan(sram_parsed.get("time_ns")) / 1e9 if sram_parsed.get("time_ns") else float('nan')
-    T_n = to_float_or_nan(jans_parsed.get("time_ns")) / 1e9 if jans_parsed.get("time_ns") else float('nan')
+def _pair_inputs(pair):
+    return [p for simout in pair
+            for p in (simout, *(os.path.join(os.path.dirname(simout), n) for n in _RUN_INPUTS))]
 
-    A_s_txt = to_int_or_zero(sram_parsed.get("l3_acc"))
-    M_s_txt = to_int_or_zero(sram_parsed.get("l3_miss"))
-    A_n_txt = to_int_or_zero(jans_parsed.get("l3_acc"))
-    M_n_txt = to_int_or_zero(jans_parsed.get("l3_miss"))
+@_sidecar_cached(".energy_inputs.json", _pair_inputs,
+                 where=lambda pair: parse_run_dir(os.path.dirname(pair[0]))[2])
+def load_pair(pair):
+    """
+    load_run for both runs of a (sram_simout, jans_simout) pair, cached jointly in
+    <out_dir>/.energy_inputs.json so an unchanged pair skips every per-run reader.
+    The two sim.out parses and the two stats DB scans are independent, so all four are
+    submitted to threads first; only the sqlite scans release the GIL (the sim.out parses
+    are regex / dict work that holds it), so what actually overlaps is the DB queries with
+    each other and with the parses. The load_run calls after them then hit the memoized
+    results (hit-cycle weighting reads read_llc_all, so it only runs once the DB scan has
+    landed in the cache).
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        wait([ex.submit(fn, arg) for simout in pair
+              for fn, arg in ((parse_simout_full, simout), (read_llc_all, os.path.dirname(simout)))])
+    return [load_run(simout) for simout in pair]
 
-    s_db = read_llc_exact_from_db(sram_dir)
-    n_db = read_llc_exact_from_db(jans_dir)
-    s_lat = read_llc_latency_from_db(sram_dir)
-    n_lat = read_llc_latency_from_db(jans_dir)
+_PRETTY_TMPL = ("{cfg}: time={T:.6f}s  L3_txt_acc/miss={A}/{M}  "
+                "-> E_bounds={Elo:.6f}..{Ehi:.6f} J  (leak={leakJ:.6f} J){eexact}"
+                "  [stats:{note}; consts:{src}]").format
 
-    s_period_ns = period_ns_from_parsed(sram_parsed)
-    n_period_ns = period_ns_from_parsed(jans_parsed)
+def config_rows(prefix, ts, cfg, simout, run, default_consts):
+    """
+    energy_bounds.csv row, summary.csv row and console line for one config of a pair,
+    built in one pass so each per-run value is looked up once and shared by all three.
+    """
+    parsed, stats = run["parsed"], run["stats"]
+    db, lat, unc_reqs = stats["exact"], stats["latency"], stats["uncore_requests"]
+    rd_cyc, wr_cyc = run["hit_cycles"]
 
-    s_rd_cyc, s_wr_cyc = parse_llc_hit_cycles(sram_dir)
-    n_rd_cyc, n_wr_cyc = parse_llc_hit_cycles(jans_dir)
+    time_ns = parsed.get("time_ns")
+    T = to_float_or_nan(time_ns) / 1e9 if time_ns else float('nan')
+    A_txt = to_int_or_zero(parsed.get("l3_acc"))
+    M_txt = to_int_or_zero(parsed.get("l3_miss"))
+    period_ns = period_ns_from_parsed(parsed)
 
     # Rebalance hits for energy use (accounts for coherency upgrades)
-    s_RH_use, s_WH_use, s_gap = reconcile_hits_for_energy(s_db) if s_db else (0, 0, 0)
-    n_RH_use, n_WH_use, n_gap = reconcile_hits_for_energy(n_db) if n_db else (0, 0, 0)
+    RH_use, WH_use, gap = reconcile_hits_for_energy(db) if db else (0, 0, 0)
 
     # Avg hit ns based on effective cycles and rebalanced hit mix
-    s_avg_hit_ns = avg_l3_hit_ns(s_rd_cyc, s_wr_cyc, s_RH_use, s_WH_use, s_period_ns)
-    n_avg_hit_ns = avg_l3_hit_ns(n_rd_cyc, n_wr_cyc, n_RH_use, n_WH_use, n_period_ns)
+    avg_hit_ns = avg_l3_hit_ns(rd_cyc, wr_cyc, RH_use, WH_use, period_ns)
 
     # uncore requests and per-request time
-    s_unc_reqs = read_uncore_requests(sram_dir)
-    n_unc_reqs = read_uncore_requests(jans_dir)
-    s_avg_unc_ns = (float(s_lat.get("l3_uncore_time_sum_ns", 0)) / s_unc_reqs) if s_unc_reqs else ""
-    n_avg_unc_ns = (float(n_lat.get("l3_uncore_time_sum_ns", 0)) / n_unc_reqs) if n_unc_reqs else ""
+    avg_unc_ns = (float(lat.get("l3_uncore_time_sum_ns", 0)) / unc_reqs) if unc_reqs else ""
 
     # --- Pick energy constants (sim.cfg overrides -> defaults) ---
-    s_consts = parse_llc_energy_consts(sram_dir) or SRAM_DEFAULT
-    n_consts = parse_llc_energy_consts(jans_dir) or JANS_DEFAULT
-
-    # Bounds
-    (s_Elo, s_Ehi), (sd_lo, sd_hi), s_leakJ = energy_bounds(
-        **s_consts, T_s=T_s, acc=A_s_txt, mis=M_s_txt)
-    (n_Elo, n_Ehi), (nd_lo, nd_hi), n_leakJ = energy_bounds(
-        **n_consts, T_s=T_n, acc=A_n_txt, mis=M_n_txt)
-
-    # Exact energies (using rebalanced hits)
-    s_dyn_exact = s_E_exact = float('nan')
-    n_dyn_exact = n_E_exact = float('nan')
-    s_exact_src = n_exact_src = ""
-    s_leakW = s_consts["P_leak_W"]
-    n_leakW = n_consts["P_leak_W"]
-
-    def mismatch_note(d):
-        if d is None:
-            return "sqlite_missing"
-        other = (d["A_db"] - d["M_db"]) - (d["RH"] + d["WH"])
-        if -2 <= other <= 2:  # tolerate ±2 boundary jitter
-            return "ok"
-        up = d.get("coh_upgrades", 0)
-        hp = d.get("hits_prefetch", 0)
-        extras = []
-        if up: extras.append(f"upgrades={up}")
-        if hp: extras.append(f"hits_prefetch={hp}")
-        suffix = ("; " + ", ".join(extras)) if extras else ""
-        return f"warn_A-M!=RH+WH(diff={other}{suffix})"
-
-    s_note = mismatch_note(s_db)
-    n_note = mismatch_note(n_db)
-
-    if s_db is not None:
-        s_dyn_exact, s_E_exact = energy_exact_from_counts(
-            s_consts["E_hit_nJ"], s_consts["E_miss_nJ"], s_consts["E_write_nJ"], s_leakW, T_s,
-            s_RH_use, s_WH_use, s_db["M_db"]
-        )
-        s_exact_src = "sqlite" + ("+rebalanced" if s_gap > 0 else "")
-
-    if n_db is not None:
-        n_dyn_exact, n_E_exact = energy_exact_from_counts(
-            n_consts["E_hit_nJ"], n_consts["E_miss_nJ"], n_consts["E_write_nJ"], n_leakW, T_n,
-            n_RH_use, n_WH_use, n_db["M_db"]
-        )
-        n_exact_src = "sqlite" + ("+rebalanced" if n_gap > 0 else "")
+    consts = run["cfg_consts"] or default_consts
+    note = mismatch_note(db)
 
     # ===== energy_bounds.csv =====
-    energy_path = os.path.join(out_dir, "energy_bounds.csv")
-    energy_header = [
-        "benchmark","n_m","config",
-        "time_s",
-        "l3_accesses","l3_misses_db","l3_read_hits","l3_write_hits",
-        "l3_writebacks","l3_evictions",
-        "leak_W","leak_J",
-        "dyn_exact_nJ","energy_exact_J","ed2p_exact_J_s2",
-        "dyn_lower_nJ","dyn_upper_nJ",
-        "energy_lower_J","energy_upper_J",
-        "ed2p_lower_J_s2","ed2p_upper_J_s2",
-        "energy_scope","exact_source","notes"
-    ]
-    def row_for(cfg, T, A_txt, M_txt, db, leakW, leakJ, dyn_exact, E_exact, dyn_pair, E_bounds, note, exact_src):
-        A = db["A_db"] if db else ""
-        M = db["M_db"] if db else ""
-        RH = db["RH"] if db else ""
-        WH = db["WH"] if db else ""
-        WB = db["WB"] if db else ""
-        EV = db["EV"] if db else ""
-        dyn_lo, dyn_hi = dyn_pair
-        Elo, Ehi = E_bounds
-        return [
-            bench_name, (n_m or ""), cfg,
-            f"{T:.6f}",
-            str(A if A != "" else A_txt), str(M if M != "" else M_txt), str(RH), str(WH),
-            str(WB), str(EV),
-            f"{leakW:.3f}", f"{leakJ:.6f}",
-            (f"{dyn_exact:.0f}" if dyn_exact == dyn_exact else ""),
-            (f"{E_exact:.6f}" if E_exact == E_exact else ""),
-            (f"{ed2p(E_exact,T):.9e}" if E_exact == E_exact else ""),
-            f"{dyn_lo:.0f}", f"{dyn_hi:.0f}",
-            f"{Elo:.6f}", f"{Ehi:.6f}",
-            f"{ed2p(Elo,T):.9e}", f"{ed2p(Ehi,T):.9e}",
-            "llc_only", exact_src, note
-        ]
-
-    s_row = row_for("SRAM", T_s, A_s_txt, M_s_txt, s_db, s_leakW, s_leakJ, s_dyn_exact, s_E_exact, (sd_lo, sd_hi), (s_Elo, s_Ehi), s_note, s_exact_src)
-    n_row = row_for("JanS", T_n, A_n_txt, M_n_txt, n_db, n_leakW, n_leakJ, n_dyn_exact, n_E_exact, (nd_lo, nd_hi), (n_Elo, n_Ehi), n_note, n_exact_src)
-    write_csv_overwrite(energy_path, energy_header, [s_row, n_row])
-    print(f"[OK] wrote {energy_path}")
+    e_row, E_lo, E_hi, leakJ, E_exact = energy_row(
+        prefix, cfg, consts, T, A_txt, M_txt, db, RH_use, WH_use, gap, note)
 
     # ===== summary.csv =====
+    s_row = [
+        ts, *prefix, cfg,
+        *[parsed.get(k) or "" for k in _SIMOUT_KEYS],
+        os.path.dirname(simout),
+        *([str(db[k]) for k in SUMMARY_DB_KEYS] if db else [""] * len(SUMMARY_DB_KEYS)),
+        *[str(lat.get(k, "")) for k in SUMMARY_LAT_KEYS],
+        str(unc_reqs),
+        "" if avg_unc_ns == "" else f"{avg_unc_ns:.6f}",
+        "" if rd_cyc is None else str(rd_cyc),
+        "" if wr_cyc is None else str(wr_cyc),
+        f"{period_ns:.9f}" if period_ns else "",
+        f"{avg_hit_ns:.6f}" if avg_hit_ns else ""
+    ]
+
+    # ===== console summary =====
+    line = _PRETTY_TMPL(cfg=cfg, T=T, A=A_txt, M=M_txt, Elo=E_lo, Ehi=E_hi, leakJ=leakJ,
+                        eexact="" if math.isnan(E_exact) else f"  |  E_exact={E_exact:.6f} J",
+                        note=note, src="defaults" if run["cfg_consts"] is None else "sim.cfg")
+    return e_row, s_row, line
+
+def process_pair(sram_simout, jans_simout):
+    """
+    Compute the energy_bounds.csv / summary.csv rows and console report for one
+    SRAM/JanS pair without writing anything (safe to run in a worker process).
+    Returns: (out_dir, energy_rows, summary_rows, report_lines)
+    """
+    bench_name, n_m, out_dir = parse_run_dir(os.path.dirname(sram_simout))
+    s_run, n_run = load_pair((sram_simout, jans_simout))
+
+    from datetime import datetime, timezone
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    prefix = (bench_name, n_m or "")   # leading cells of every energy / summary row
+
+    s_energy, s_summary, s_line = config_rows(prefix, ts, "SRAM", sram_simout, s_run, SRAM_DEFAULT)
+    n_energy, n_summary, n_line = config_rows(prefix, ts, "JanS", jans_simout, n_run, JANS_DEFAULT)
+    return out_dir, [s_energy, n_energy], [s_summary, n_summary], [s_line, n_line]
+
+
+def write_pair(out_dir, energy_rows, summary_rows, report):
+    energy_path = os.path.join(out_dir, "energy_bounds.csv")
+    write_csv_overwrite(energy_path, ENERGY_HEADER, energy_rows)
+    print(f"[OK] wrote {energy_path}")
+
     summary_path = os.path.join(out_dir, "summary.csv")
-    summary_header = [
-        "timestamp_utc","benchmark","n_m","config",
-        "instructions","cycles","ipc","time_ns",
-        "l3_acc_text","l3_miss_text","l3_miss_rate_pct",
-        "dram_acc","dram_lat_value","dram_lat_unit",
-        "outdir",
-        "l3_accesses_db","l3_misses_db","l3_read_hits","l3_write_hits","l3_writebacks","l3_evictions","l3_misses_custom",
-        "l3_total_latency_ns","l3_mshr_latency_ns","l3_snoop_latency_ns","l3_qbs_latency_ns","l3_uncore_time_sum_ns",
-        "l3_uncore_requests","avg_uncore_time_per_req_ns",
-        "rd_hit_cycles","wr_hit_cycles","core_period_ns","avg_l3_hit_ns"
-    ]
-    def srow(cfg, parsed, run_dir, db, lat, unc_reqs, rd_cyc, wr_cyc, period_ns, avg_hit_ns, avg_unc_ns):
-        return [
-            ts, bench_name, (n_m or ""), cfg,
-            parsed.get("instructions") or "",
-            parsed.get("cycles") or "",
-            parsed.get("ipc") or "",
-            parsed.get("time_ns") or "",
-            parsed.get("l3_acc") or "",
-            parsed.get("l3_miss") or "",
-            parsed.get("l3_miss_rate_pct") or "",
-            parsed.get("dram_acc") or "",
-            parsed.get("dram_lat_value") or "",
-            parsed.get("dram_lat_unit") or "",
-            run_dir,
-            str(db["A_db"]) if db else "",
-            str(db["M_db"]) if db else "",
-            str(db["RH"])   if db else "",
-            str(db["WH"])   if db else "",
-            str(db["WB"])   if db else "",
-            str(db["EV"])   if db else "",
-            str(db["M_custom"]) if db else "",
-            str(lat.get("l3_total_latency_ns","")),
-            str(lat.get("l3_mshr_latency_ns","")),
-            str(lat.get("l3_snoop_latency_ns","")),
-            str(lat.get("l3_qbs_latency_ns","")),
-            str(lat.get("l3_uncore_time_sum_ns","")),
-            str(unc_reqs),
-            (f"{avg_unc_ns:.6f}" if isinstance(avg_unc_ns, (float,int)) and avg_unc_ns != "" else ""),
-            str(rd_cyc if rd_cyc is not None else ""),
-            str(wr_cyc if wr_cyc is not None else ""),
-            (f"{period_ns:.9f}" if period_ns else ""),
-            (f"{avg_hit_ns:.6f}" if avg_hit_ns else "")
-        ]
-
-    write_csv_overwrite(summary_path, summary_header, [
-        srow("SRAM", sram_parsed, sram_dir, s_db, s_lat, s_unc_reqs, s_rd_cyc, s_wr_cyc, s_period_ns, s_avg_hit_ns, s_avg_unc_ns),
-        srow("JanS", jans_parsed, jans_dir, n_db, n_lat, n_unc_reqs, n_rd_cyc, n_wr_cyc, n_period_ns, n_avg_hit_ns, n_avg_unc_ns),
-    ])
+    write_csv_overwrite(summary_path, SUMMARY_HEADER, summary_rows)
     print(f"[OK] wrote {summary_path}")
 
     # ===== console summary =====
     print("\n==== Post-run LLC energy ====")
-    def pretty(cfg, T, A_txt, M_txt, E_bounds, leakJ, E_exact, note, consts_src):
-        Elo, Ehi = E_bounds
-        src = "sim.cfg" if consts_src else "defaults"
-        print(f"{cfg}: time={T:.6f}s  L3_txt_acc/miss={A_txt}/{M_txt}  "
-              f"-> E_bounds={Elo:.6f}..{Ehi:.6f} J  (leak={leakJ:.6f} J)"
-              f"{'  |  E_exact='+format(E_exact,'.6f')+' J' if E_exact==E_exact else ''}"
-              f"  [stats:{note}; consts:{src}]")
-
-    pretty("SRAM", T_s, A_s_txt, M_s_txt, (s_Elo, s_Ehi), s_leakJ, s_E_exact, s_note,
-           parse_llc_energy_consts(sram_dir) is not None)
-    pretty("JanS", T_n, A_n_txt, M_n_txt, (n_Elo, n_Ehi), n_leakJ, n_E_exact, n_note,
-           parse_llc_energy_consts(jans_dir) is not None)
+    for line in report:
+        print(line)
+
+def _process_pair_args(pair):
+    return process_pair(*pair)
+
+def batch(pairs, max_workers=None, mp_context=None):
+    """
+    Process many (sram_simout, jans_simout) pairs in a process pool (pairs are
+    independent) and write each bench's CSVs from the parent, in input order.
+    Workers get the parent's cache setting explicitly: under spawn / forkserver they
+    re-import this module and would otherwise start with the default _USE_CACHE.
+    """
+    if len(pairs) <= 1 or max_workers == 1:
+        results = map(_process_pair_args, pairs)
+        for res in results:
+            write_pair(*res)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(max_workers or os.cpu_count() or 1, len(pairs))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_set_use_cache, initargs=(_USE_CACHE,)) as ex:
+        chunk = max(1, len(pairs) // (workers * 4))
+        for res in ex.map(_process_pair_args, pairs, chunksize=chunk):
+            write_pair(*res)
+
+def read_pairs(path):
+    """
+    '<sram_simout><TAB><jans_simout>' per line (tab-separated so paths may hold spaces or '#');
+    blank lines and lines starting with '#' are skipped.
+    """
+    pairs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            pair = line.split("\t")
+            if len(pair) != 2 or not all(pair):
+                raise SystemExit(f"[ERR] expected '<sram_simout><TAB><jans_simout>' in {path}: {line!r}")
+            pairs.append(tuple(pair))
+    return pairs
+
+# =========================
+# Main
+# =========================
+def main():
+    ap = argparse.ArgumentParser(description="Write energy_bounds.csv and summary.csv to <OUT_ROOT>/output_<bench>/")
+    ap.add_argument("sram_simout", nargs="?", help="Path to SRAM sim.out")
+    ap.add_argument("jans_simout", nargs="?", help="Path to JanS sim.out")
+    ap.add_argument("--pairs", help="File with one '<sram_simout><TAB><jans_simout>' pair per line (batch mode)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes for --pairs (default: all CPUs)")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not write the per-run sidecar caches")
+    args = ap.parse_args()
+
+    _set_use_cache(not args.no_cache)
+
+    pairs = read_pairs(args.pairs) if args.pairs else []
+    if args.sram_simout or args.jans_simout:
+        if not (args.sram_simout and args.jans_simout):
+            ap.error("sram_simout and jans_simout must be given together")
+        pairs.insert(0, (args.sram_simout, args.jans_simout))
+    if not pairs:
+        ap.error("give <sram_simout> <jans_simout> and/or --pairs FILE")
+
+    pairs = [(os.path.abspath(s), os.path.abspath(j)) for s, j in pairs]
+
+    # hard fail on bad paths (one stat per distinct sim.out)
+    for p in dict.fromkeys(p for pair in pairs for p in pair):
+        try:
+            ok = stat.S_ISREG(os.stat(p).st_mode)
+        except OSError:
+            ok = False
+        if not ok:
+            raise SystemExit(f"[ERR] sim.out not found: {p}")
+
+    batch(pairs, args.jobs)
 
 if __name__ == "__main__":
     main()
-
@@ -1,140 +1,151 @@
 #!/usr/bin/env python3
-import argparse, re, math, os, gzip
-from collections import Counter
-
-LINE_COLON = re.compile(r'^\s*(0x[0-9a-fA-F]+)\s*:\s*(\d+)\s*,\s*([A-Za-z]+)')
-VIEW_RW_COMMA = re.compile(r'.*?,\s*([RrWw])\s*,\s*(\d+)\s*,\s*(0x[0-9a-fA-F]+)')
-VIEW_RW_SPACE = re.compile(r'^\s*\d+\s+\d+:\s+\d+\s+(read|write)\s+(\d+)\s+byte\(s\)\s+@\s+(0x[0-9a-fA-F]+)')
-
-def parse_kind_addr(line):
-    # 1) "0xADDR: SIZE, KIND"
-    m = LINE_COLON.match(line)
-    if m:
-        addr = int(m.group(1), 16)
-        k = m.group(3).lower()
-        if k.startswith('r'):  return 'R', addr
-        if k.startswith('w'):  return 'W', addr
-        return None, None
-
-    # 2) CSV "pc,r/w,size,addr"
-    parts = [p.strip() for p in line.split(',')]
-    if len(parts) >= 4:
-        k = parts[1].lower()
-        try:
-            if k.startswith('r') or k == 'load':  return 'R', int(parts[3], 16)
-            if k.startswith('w') or k == 'store': return 'W', int(parts[3], 16)
-        except Exception:
-            pass
-
-    # 3) drcachesim view (comma form)
-    m = VIEW_RW_COMMA.match(line)
-    if m:
-        kind = 'R' if m.group(1).lower().startswith('r') else 'W'
-        addr = int(m.group(3), 16)
-        return kind, addr
-
-    # 4) drcachesim view (space form like: "write 8 byte(s) @ 0xADDR ...")
-    m = VIEW_RW_SPACE.match(line)
-    if m:
-        kind = 'R' if m.group(1).lower() == 'read' else 'W'
-        addr = int(m.group(3), 16)
-        return kind, addr
-
-    return None, None
-
-def entropy(counter):
-    t = sum(counter.values())
-    if t == 0: return 0.0
-    H = 0.0
-    for c in counter.values():
-        p = c / t
-        H -= p * math.log2(p)
-    return H
-
-def footprint90(counter):
-    t = sum(counter.values())
-    if t == 0: return 0
-    need = 0.9 * t
-    acc = 0; cnt = 0
-    for _, c in counter.most_common():
-        acc += c; cnt += 1
-        if acc >= need: break
-    return cnt
-
-def parse_kind_addr(line):
-    # Supports both "0xADDR: SIZE, KIND" and "pc,r/w,size,addr"
-    m = LINE_COLON.match(line)
-    if m:
-        addr = int(m.group(1), 16)
-        k = m.group(3).lower()
-        if k in ('r','read','load','ld','mem-read'):  return 'R', addr
-        if k in ('w','write','store','st','mem-write'): return 'W', addr
-        return None, None
-    parts = [p.strip() for p in line.split(',')]
-    if len(parts) >= 4:
-        k = parts[1].lower()
-        try:
-            addr = int(parts[3], 16)
-        except Exception:
-            return None, None
-        if k.startswith('r'): return 'R', addr
-        if k.startswith('w'): return 'W', addr
-    return None, None
-
-# scripts/mem_metrics_unit.py
-import os, gzip
+import argparse, re, os, gzip, io, array, csv
+import numpy as np
+
+# native block parser, built with: cythonize -i scripts/_mem_metrics_unit.pyx
+try:
+    import _mem_metrics_unit
+except ImportError:
+    _mem_metrics_unit = None
+
+def entropy(counts):
+    """Shannon entropy (bits) of a count array with no zero entries (np.unique output)."""
+    total = counts.sum()
+    if total == 0: return 0.0
+    p = counts.astype(np.float64) / total
+    return float(-np.dot(p, np.log2(p)))
+
+def footprint90(counts):
+    """Fewest keys covering >= 90% of accesses: one sort + cumsum + binary search."""
+    if counts.size == 0: return 0
+    cs = np.cumsum(np.sort(counts)[::-1])
+    return int(np.searchsorted(cs, 0.9 * cs[-1], side='left') + 1)
+
+def histogram(keys):
+    """Per-key access counts of a uint64 key array (order irrelevant to the metrics)."""
+    return np.unique(keys, return_counts=True)[1]
+
+IO_BUFFER = 1 << 20     # 1 MiB: the block reader asks for ~16 MB at a time anyway
+
+def open_gz(path):
+    # gzip's own reader sits behind an 8 KiB buffer; give the decompressed stream a large one
+    return io.TextIOWrapper(io.BufferedReader(gzip.open(path, 'rb'), buffer_size=IO_BUFFER),
+                            errors='ignore')
+
 def open_any(path):
     if path.endswith('.gz'):
-        return gzip.open(path, 'rt', errors='ignore')
+        return open_gz(path)
     plain_exists = os.path.exists(path)
     gz_exists    = os.path.exists(path + '.gz')
     plain_is_empty = plain_exists and os.path.getsize(path) == 0
     if plain_exists and not plain_is_empty:
-        return open(path, 'r', errors='ignore')
+        return open(path, 'r', buffering=IO_BUFFER, errors='ignore')
     if gz_exists:
-        return gzip.open(path + '.gz', 'rt', errors='ignore')
+        return open_gz(path + '.gz')
     raise FileNotFoundError(path)
 
+# Both trace record forms, as one multiline pattern over a whole block:
+#   colon: "0xADDR: SIZE, KIND"         -> groups 1 (addr), 2 (kind word)
+#   csv:   "pc,r/w,size,addr[,...]"     -> groups 3 (r/w letter), 4 (addr, optional 0x)
+# [^\S\n] is whitespace that stays on the line. Addresses are capped at 16 hex digits (uint64).
+TRACE_RECORD = re.compile(
+    r'^[^\S\n]*0x([0-9a-fA-F]{1,16})[^\S\n]*:[^\S\n]*\d+[^\S\n]*,[^\S\n]*([A-Za-z]+)'
+    r'|^(?!Format:)[^,\n]*,[^\S\n]*([RrWw])[^,\n]*,[^,\n]*,[^\S\n]*(?:0[xX])?([0-9a-fA-F]{1,16})[^\S\n]*(?:,|$)',
+    re.M)
+READ_KINDS  = ['r', 'read', 'load', 'ld']
+WRITE_KINDS = ['w', 'write', 'store', 'st']
+CHUNK_CHARS = 1 << 24   # traces are scanned in ~16 MB newline-aligned blocks
+
+_HEX_LUT = np.zeros(256, dtype=np.uint64)
+_HEX_LUT[np.frombuffer(b'0123456789abcdef', dtype=np.uint8)] = np.arange(16)
+_HEX_LUT[np.frombuffer(b'ABCDEF', dtype=np.uint8)] = np.arange(10, 16)
+
+def parse_hex(tokens):
+    """
+    Vectorized int(tok, 16) over a str array of 1-16 digit hex tokens (no 0x prefix, as
+    TRACE_RECORD captures them). The tokens' UCS-4 code points go through a nibble LUT
+    and each digit is shifted into place by its distance from the token's end.
+    """
+    cp = tokens.astype('U16', copy=False).view(np.uint32).reshape(-1, 16)   # NUL-padded
+    live = cp != 0
+    ndig = live.sum(axis=1, dtype=np.uint64)
+    shift = (ndig[:, None] - np.arange(1, 17, dtype=np.uint64)) << np.uint64(2)
+    nib = np.where(live, _HEX_LUT[np.minimum(cp, 255)] << shift, np.uint64(0))
+    return np.bitwise_or.reduce(nib, axis=1)
+
+def parse_block(text):
+    """Return (addr uint64, is_write bool) arrays for every read/write record in a block of lines."""
+    recs = TRACE_RECORD.findall(text)
+    if not recs:
+        return np.zeros(0, np.uint64), np.zeros(0, bool)
+    cols = np.array(recs)
+    colon = cols[:, 0] != ''
+    kind = np.char.lower(np.where(colon, cols[:, 1], cols[:, 2]))
+    is_write = np.isin(kind, WRITE_KINDS)
+    keep = is_write | np.isin(kind, READ_KINDS)
+    addr = parse_hex(np.where(colon, cols[:, 0], cols[:, 3])[keep])
+    return addr, is_write[keep]
+
+def read_blocks(f):
+    """Yield (addr, is_write) arrays for an open trace, one newline-aligned block at a time."""
+    if _mem_metrics_unit is not None:
+        # the native parser takes raw bytes: read the binary stream under the text layer
+        raw = f.buffer
+        while True:
+            data = raw.read(CHUNK_CHARS)
+            if not data:
+                return
+            yield _mem_metrics_unit.parse_block(data + raw.readline())
+    while True:
+        text = f.read(CHUNK_CHARS)
+        if not text:
+            return
+        yield parse_block(text + f.readline())
+
 def compute_metrics(paths, M, unit_shift, exclude_stack):
-    R = Counter(); W = Counter(); Rloc = Counter(); Wloc = Counter()
     if isinstance(paths, str): paths = [paths]
+    # raw addresses only, appended in place per block; counted once at the end
+    reads = array.array('Q'); writes = array.array('Q')
     for p in paths:
         with open_any(p) as f:
-            for line in f:
-                if not line.strip() or line.startswith('Format:'): continue
-                k, addr = parse_kind_addr(line)
-                if not k: continue
-                if exclude_stack and (0x00007fff00000000 <= addr < 0x0000800000000000):
+            for addr, is_write in read_blocks(f):
+                if exclude_stack:
                     # crude "likely user stack" filter in Linux user VA space
-                    continue
-                key = addr >> unit_shift  # 0: byte, 6: line(64B), 12: page(4KiB)
-                if k == 'R':
-                    R[key] += 1;  Rloc[addr >> M] += 1
-                else:
-                    W[key] += 1;  Wloc[addr >> M] += 1
+                    heap = (addr < np.uint64(0x00007fff00000000)) | (addr >= np.uint64(0x0000800000000000))
+                    addr, is_write = addr[heap], is_write[heap]
+                reads.frombytes(addr[~is_write].view(np.uint8))
+                writes.frombytes(addr[is_write].view(np.uint8))
+    r = np.frombuffer(reads, np.uint64); w = np.frombuffer(writes, np.uint64)
+    shift = np.uint64(unit_shift)  # 0: byte, 6: line(64B), 12: page(4KiB)
+    R = histogram(r >> shift); W = histogram(w >> shift)
+    Rloc = histogram(r >> np.uint64(M)); Wloc = histogram(w >> np.uint64(M))
     return {
-        "read_total": sum(R.values()), "read_unique": len(R),
+        "read_total": int(R.sum()), "read_unique": len(R),
         "read_entropy": entropy(R), "read_local_entropy": entropy(Rloc),
         "read_footprint90": footprint90(R),
-        "write_total": sum(W.values()), "write_unique": len(W),
+        "write_total": int(W.sum()), "write_unique": len(W),
         "write_entropy": entropy(W), "write_local_entropy": entropy(Wloc),
         "write_footprint90": footprint90(W)
     }
 
-def append_csv(csv_path, name, M, m):
+CSV_HEADER = [
+    "name","M",
+    "read_total","read_unique","read_entropy","read_local_entropy","read_footprint90",
+    "write_total","write_unique","write_entropy","write_local_entropy","write_footprint90"
+]
+
+def append_csv(csv_path, rows):
+    """Append (name, M, metrics) rows to csv_path in one open, writing the header for a new file."""
     new = not os.path.exists(csv_path)
-    with open(csv_path, 'a') as f:
+    with open(csv_path, 'a', newline='', buffering=IO_BUFFER) as f:
+        w = csv.writer(f, lineterminator='\n')
         if new:
-            f.write(",".join([
-                "name","M",
-                "read_total","read_unique","read_entropy","read_local_entropy","read_footprint90",
-                "write_total","write_unique","write_entropy","write_local_entropy","write_footprint90"
-            ]) + "\n")
-        f.write(",".join(map(str, [
+            w.writerow(CSV_HEADER)
+        w.writerows([
             name, M,
             m["read_total"], m["read_unique"], f"{m['read_entropy']:.6f}", f"{m['read_local_entropy']:.6f}", m["read_footprint90"],
             m["write_total"], m["write_unique"], f"{m['write_entropy']:.6f}", f"{m['write_local_entropy']:.6f}", m["write_footprint90"],
-        ])) + "\n")
+        ] for name, M, m in rows)
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
@@ -147,5 +158,5 @@ if __name__ == "__main__":
     args = ap.parse_args()
     unit_shift = {"byte":0, "line":6, "page":12}[args.unit]
     m = compute_metrics(args.tracefiles, args.M, unit_shift, args.exclude_stack)
-    append_csv(args.csv, args.name, args.M, m)
+    append_csv(args.csv, [(args.name, args.M, m)])
     print(m)
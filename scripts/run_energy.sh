@@ -12,7 +12,10 @@ ROOT="/home/skataoka26/COSC_498/miniMXE"
 RESULTS="/home/skataoka26/COSC_498/miniMXE/results/${RUN_ID}"
 PY_SCRIPT="/home/skataoka26/COSC_498/miniMXE/scripts/energy_ed2p_v3.py"
 
-# --- Phase 1: run python for each SRAM/JanS pair ---
+# --- Phase 1: collect SRAM/JanS pairs, then run python once over all of them ---
+PAIRS="$(mktemp)"
+trap 'rm -f "${PAIRS}"' EXIT
+
 for SRAM_DIR in "${RESULTS}"/*_sram_*; do
   [ -d "${SRAM_DIR}" ] || continue
   [ -f "${SRAM_DIR}/sim.out" ] || continue
@@ -28,12 +31,14 @@ for SRAM_DIR in "${RESULTS}"/*_sram_*; do
     continue
   fi
 
-  # absolute-path run
-  python3 "/home/skataoka26/COSC_498/miniMXE/scripts/energy_ed2p_v3.py" \
-          "${SRAM_DIR}/sim.out" \
-          "${JANS_DIR}/sim.out"
+  printf '%s\t%s\n' "${SRAM_DIR}/sim.out" "${JANS_DIR}/sim.out" >> "${PAIRS}"
 done
 
+# one interpreter for every pair (parallel across benches; see energy_ed2p_v3.py --pairs)
+if [ -s "${PAIRS}" ]; then
+  python3 "${PY_SCRIPT}" --pairs "${PAIRS}"
+fi
+
 # --- Phase 2: cat all CSVs from each output_* directory ---
 for OUT_DIR in "${RESULTS}"/output_*; do
   [ -d "${OUT_DIR}" ] || continue
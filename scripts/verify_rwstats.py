@@ -6,41 +6,84 @@ NUM_RE = re.compile(
     r'([A-Za-z0-9_]+)='
     r'([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|nan|NaN|inf|Inf|Infinity)'
 )
+_NUM_TAIL = frozenset('0123456789.')   # a plain number token ends in one of these
+
+def _num_re_fields(tok, d):
+    for k, v in NUM_RE.findall(tok):
+        vl = v.lower()
+        if vl == 'nan':
+            d[k] = math.nan
+        elif vl in ('inf', 'infinity'):
+            d[k] = math.inf
+        else:
+            try:
+                d[k] = float(v)
+            except ValueError:
+                pass
+
+def parse_fields(s):
+    """
+    {key: float} for the key=number tokens of one scope= line. Plain "key=123.4" tokens
+    go through str.split/partition + float(); anything else (nan/inf words, units,
+    comma-joined pairs, odd keys) falls back to NUM_RE on that token, which gives the
+    same result a NUM_RE scan of the whole line would.
+    """
+    d = {}
+    for tok in s.split():
+        k, eq, v = tok.partition('=')
+        if (eq and v[-1:] in _NUM_TAIL and '_' not in v and k.isascii()
+                and k.replace('_', 'a').isalnum()):
+            try:
+                d[k] = float(v)
+                continue
+            except ValueError:
+                pass
+        _num_re_fields(tok, d)
+    return d
+
+TAIL_BLOCK = 1 << 16
+
+def tail_scope_lines(path, n):
+    """
+    The last n stripped scope= lines of path, oldest first, read backwards from EOF in
+    TAIL_BLOCK chunks so only the end of a multi-GB log is touched.
+    """
+    found = []
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        frag = b''                  # head of the block after this one: maybe a partial line
+        while pos > 0 and len(found) < n:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + frag).splitlines()   # same \n, \r, \r\n breaks as text mode
+            frag = lines.pop(0) if pos > 0 and lines else b''
+            for line in reversed(lines):
+                if b'scope=' in line:
+                    s = line.decode(errors='ignore').strip()
+                    if s.startswith('scope='):
+                        found.append(s)
+                        if len(found) == n:
+                            break
+    return found[::-1]
 
 def parse_scope_lines(path, n=2):
     """Return up to the last n scope= lines parsed into dicts (with '_raw')."""
-    lines = []
     try:
-        with open(path, 'r', errors='ignore') as f:
-            for line in f:
-                s = line.strip()
-                if s.startswith('scope=') and '=' in s:
-                    lines.append(s)
+        selected = tail_scope_lines(path, n)
     except OSError as e:
         return []
 
-    selected = lines[-n:] if lines else []
     out = []
     for s in selected:
-        d = {}
-        for k, v in NUM_RE.findall(s):
-            vl = v.lower()
-            if vl == 'nan':
-                d[k] = math.nan
-            elif vl in ('inf', 'infinity'):
-                d[k] = math.inf
-            else:
-                try:
-                    d[k] = float(v)
-                except ValueError:
-                    pass
+        d = parse_fields(s)
         d['_raw'] = s
         out.append(d)
     return out
 
 # ---------- helpers ----------
 def almost_eq(a, b, rel=0.01, abs_tol=1.0):
-    if any(math.isnan(x) for x in (a, b)):
+    if math.isnan(a) or math.isnan(b):
         return None
     return abs(a - b) <= max(abs_tol, rel * max(abs(a), abs(b)))
 
@@ -74,7 +117,7 @@ def check_percentiles(stats, line_bytes):
         kl = f"p{p}_strideL"
         if kb in stats and kl in stats:
             B = stats[kb]; L = stats[kl]
-            if any(x is None or math.isnan(x) for x in (B, L)):
+            if B is None or math.isnan(B) or L is None or math.isnan(L):
                 items.append((f"{kb} == {kl}*{int(line_bytes)}", None, "NaN/missing"))
                 continue
             expectB = L * line_bytes
@@ -126,7 +169,7 @@ def check_invariants(last, prev, line_bytes):
         uul = f"{kind}_unique_lines"
         if f90 in last and uul in last:
             f90v = last[f90]; uulv = last[uul]
-            if any(math.isnan(x) for x in (f90v, uulv)):
+            if math.isnan(f90v) or math.isnan(uulv):
                 checks.append((f"{f90} ≤ {uul}", None, "NaN"))
             else:
                 checks.append((f"{f90} ≤ {uul}", f90v <= uulv, f"{f90v} ≤ {uulv}"))
@@ -153,20 +196,20 @@ def check_invariants(last, prev, line_bytes):
     if prev:
         for k in ('reads','writes','global_footprint_bytes','read_unique_lines','write_unique_lines'):
             a, b = prev.get(k), last.get(k)
-            if a is None or b is None or any(math.isnan(x) for x in (a, b)):
+            if a is None or b is None or math.isnan(a) or math.isnan(b):
                 checks.append((f"{k} monotonic (prev→last)", None, "missing"))
             else:
                 checks.append((f"{k} monotonic (prev→last)", b >= a, f"{a}→{b}"))
 
         # Δreads ≈ read_total ; Δwrites ≈ write_total
         if all(k in last and k in prev for k in ('reads','read_total','writes','write_total')):
-            if not any(math.isnan(x) for x in (last['reads'], prev['reads'], last['read_total'])):
+            if not (math.isnan(last['reads']) or math.isnan(prev['reads']) or math.isnan(last['read_total'])):
                 dR = last['reads'] - prev['reads']
                 ok = almost_eq(dR, last['read_total'], rel=0.02, abs_tol=5.0)
                 checks.append(("Δreads ≈ read_total", ok, f"Δ={dR} vs {last['read_total']}"))
             else:
                 checks.append(("Δreads ≈ read_total", None, "NaN"))
-            if not any(math.isnan(x) for x in (last['writes'], prev['writes'], last['write_total'])):
+            if not (math.isnan(last['writes']) or math.isnan(prev['writes']) or math.isnan(last['write_total'])):
                 dW = last['writes'] - prev['writes']
                 ok = almost_eq(dW, last['write_total'], rel=0.02, abs_tol=5.0)
                 checks.append(("Δwrites ≈ write_total", ok, f"Δ={dW} vs {last['write_total']}"))
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import os, sys, subprocess, pathlib, datetime, copy
+import os, sys, subprocess, pathlib, datetime
 
 # Requires PyYAML:  pip install --user pyyaml
 try:
@@ -7,18 +7,31 @@ try:
 except Exception as e:
     print("[ERR] PyYAML not installed. Do: pip install --user pyyaml")
     raise
+# libyaml-backed safe loader when PyYAML was built with it, same results either way
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 def now_utc_tag():
     return datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
 
+_TIMESTAMP_TOK = "{timestamp}"
+
 def expand_string(s: str, context: dict) -> str:
     if not isinstance(s, str):
         return s
+    # most config leaves are plain values: skip all three passes
+    if "{" not in s and "$" not in s and "~" not in s:
+        return s
     # simple placeholders
-    s = s.replace("{timestamp}", context["timestamp"])
+    if _TIMESTAMP_TOK in s:
+        s = s.replace(_TIMESTAMP_TOK, context["timestamp"])
     # env-style vars like ${PWD} and ~
-    s = os.path.expandvars(s)
-    s = os.path.expanduser(s)
+    if "$" in s:
+        s = os.path.expandvars(s)
+    if s.startswith("~"):
+        s = os.path.expanduser(s)
     return s
 
 def deep_expand(obj, ctx):
@@ -66,7 +79,7 @@ def merge_llc_to_env(cfg: dict, env: dict):
     put("JANS_P_LEAK",  ej.get("p_leak_mW"))
 
 def build_env(cfg: dict) -> dict:
-    env = copy.deepcopy(os.environ)
+    env = dict(os.environ)
     # generic env block
     for k, v in (cfg.get("env") or {}).items():
         env[k] = str(v)
@@ -84,17 +97,18 @@ def build_env(cfg: dict) -> dict:
         env["BENCHMARKS"] = ",".join(benches)
     return env
 
-def write_stamp_yaml(cfg_path: str, out_root: str):
+def write_stamp_yaml(cfg_text: str, out_root: str):
     try:
         out = pathlib.Path(out_root)
         out.mkdir(parents=True, exist_ok=True)
         stamp = out / f"config_used_{now_utc_tag()}.yaml"
-        stamp.write_text(pathlib.Path(cfg_path).read_text())
+        stamp.write_text(cfg_text)
     except Exception as e:
         print(f"[WARN] could not write config stamp to {out_root}: {e}")
 
 def submit(cfg_path: str):
-    cfg_raw = yaml.safe_load(pathlib.Path(cfg_path).read_text())
+    cfg_text = pathlib.Path(cfg_path).read_text()   # parsed here and stamped verbatim below
+    cfg_raw = yaml.load(cfg_text, Loader=YamlLoader)
     ctx = {"timestamp": now_utc_tag()}
     cfg = deep_expand(cfg_raw, ctx)
 
@@ -114,7 +128,7 @@ def submit(cfg_path: str):
     env = build_env(cfg)
     out_root = env.get("OUT_ROOT") or cfg.get("env", {}).get("OUT_ROOT")
     if out_root:
-        write_stamp_yaml(cfg_path, out_root)
+        write_stamp_yaml(cfg_text, out_root)
 
     cmd = ["sbatch", *sbatch_args, script]
     print("[INFO] submitting:", " ".join(cmd))
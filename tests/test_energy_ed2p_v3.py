@@ -0,0 +1,62 @@
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scripts"))
+import energy_ed2p_v3 as en
+
+SIMOUT = """                                     | Core 0
+  Instructions                       | 100000000
+  Cycles                             | 50000000
+  IPC                                | 2.00
+  Time (ns)                          | 25000000
+Cache L3                             |
+  num cache accesses                 | 123456
+  num cache misses                   | 2345
+  miss rate                          | 1.90%
+DRAM summary                         |
+  num dram accesses                  | 2345
+  average dram access latency (ns)   | 85.50
+"""
+
+def make_pair(root, bench):
+    pair = []
+    for cfg in ("sram", "jans"):
+        run_dir = os.path.join(root, f"{bench}_{cfg}_10M")
+        os.makedirs(run_dir)
+        with open(os.path.join(run_dir, "sim.out"), "w") as f:
+            f.write(SIMOUT)
+        pair.append(os.path.join(run_dir, "sim.out"))
+    return tuple(pair)
+
+def sidecars(root):
+    return sorted(os.path.join(d, n) for d, _, names in os.walk(root)
+                  for n in names if n.startswith(".") and n.endswith(".json"))
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.addCleanup(en._set_use_cache, True)
+
+    def test_no_cache_reaches_spawned_workers(self):
+        pairs = [make_pair(self.root, "500_a"), make_pair(self.root, "600_b")]
+        en._set_use_cache(False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            en.batch(pairs, max_workers=2, mp_context=mp.get_context("spawn"))
+        self.assertTrue(os.path.exists(os.path.join(self.root, "output_600_b", "energy_bounds.csv")))
+        self.assertEqual(sidecars(self.root), [])
+
+    def test_first_run_writes_pair_sidecar(self):
+        pair = make_pair(self.root, "700_c")
+        with contextlib.redirect_stdout(io.StringIO()):
+            en.batch([pair])
+        self.assertTrue(os.path.exists(os.path.join(self.root, "output_700_c", ".energy_inputs.json")))
+
+if __name__ == "__main__":
+    unittest.main()